@@ -26,8 +26,16 @@ def create_app():
     app.register_blueprint(todos_bp, url_prefix="/todos")
     app.register_blueprint(weather_bp, url_prefix="/weather")
 
-    # Create database tables
+    # Create database tables and upgrade existing ones
     with app.app_context():
+        from app.migrations import upgrade_schema
+
         db.create_all()
+        upgrade_schema()
+
+    # Refresh upstream data in the background
+    from app.services.scheduler import start_scheduler
+
+    start_scheduler(app)
 
     return app
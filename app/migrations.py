@@ -0,0 +1,103 @@
+from sqlalchemy import inspect, text
+from app import db
+from app.models.calendar import CalendarEvent, CalendarSyncState
+
+# Tables that only mirror upstream data. When their primary key changes they
+# are dropped and rebuilt (and re-synced from Google) instead of migrated.
+CACHE_TABLES = [CalendarSyncState.__table__, CalendarEvent.__table__]
+
+# Tables and columns no model uses any more, dropped from existing databases
+OBSOLETE_TABLES = ["calendars"]
+OBSOLETE_COLUMNS = {
+    "weather_data": ["current_updated", "forecast_updated", "alerts_updated"],
+}
+
+
+def upgrade_schema():
+    """Bring an existing homeview.db up to date with the current models.
+
+    db.create_all() only creates missing tables, so new columns and indexes on
+    existing tables are applied here.
+    """
+    engine = db.engine
+    inspector = inspect(engine)
+
+    if any(_primary_key_changed(inspector, table) for table in CACHE_TABLES):
+        print("Rebuilding calendar cache tables for new schema")
+        for table in CACHE_TABLES:
+            table.drop(engine, checkfirst=True)
+        db.create_all()
+        inspector = inspect(engine)
+
+    if _drop_obsolete(inspector):
+        inspector = inspect(engine)
+
+    indexes_created = False
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        _add_missing_columns(inspector, table)
+        indexes_created |= _create_missing_indexes(inspector, table)
+
+    if indexes_created:
+        # Refresh query planner statistics so the new indexes get used
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+
+
+def _drop_obsolete(inspector):
+    dropped = False
+    with db.engine.begin() as connection:
+        for table_name in OBSOLETE_TABLES:
+            if inspector.has_table(table_name):
+                connection.execute(text(f"DROP TABLE {table_name}"))
+                print(f"Dropped table {table_name}")
+                dropped = True
+
+        for table_name, columns in OBSOLETE_COLUMNS.items():
+            if not inspector.has_table(table_name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table_name)}
+            for column in columns:
+                if column in existing:
+                    connection.execute(
+                        text(f'ALTER TABLE {table_name} DROP COLUMN "{column}"')
+                    )
+                    print(f"Dropped column {table_name}.{column}")
+                    dropped = True
+    return dropped
+
+
+def _primary_key_changed(inspector, table):
+    if not inspector.has_table(table.name):
+        return False
+    existing = inspector.get_pk_constraint(table.name).get("constrained_columns", [])
+    return set(existing) != {column.name for column in table.primary_key.columns}
+
+
+def _create_missing_indexes(inspector, table):
+    existing = {index["name"] for index in inspector.get_indexes(table.name)}
+    created = False
+    for index in table.indexes:
+        if index.name not in existing:
+            index.create(db.engine)
+            print(f"Created index {index.name}")
+            created = True
+    return created
+
+
+def _add_missing_columns(inspector, table):
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    dialect = db.engine.dialect
+
+    with db.engine.begin() as connection:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=dialect)
+            connection.execute(
+                text(
+                    f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+                )
+            )
+            print(f"Added column {table.name}.{column.name}")
@@ -1,6 +1,16 @@
-from .calendar import CalendarEvent
+from .cache import CacheEntry
+from .calendar import CalendarEvent, CalendarSyncState
 from .chores import Chore
+from .sheets import SheetMutation
 from .todos import Todo
 from .weather import WeatherData
 
-__all__ = ["CalendarEvent", "Chore", "Todo", "WeatherData"]
+__all__ = [
+    "CacheEntry",
+    "CalendarEvent",
+    "CalendarSyncState",
+    "Chore",
+    "SheetMutation",
+    "Todo",
+    "WeatherData",
+]
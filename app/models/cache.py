@@ -0,0 +1,23 @@
+from app import db
+from datetime import datetime
+import json
+
+
+class CacheEntry(db.Model):
+    """Persistent tier of the two-tier cache (see app/services/cache.py)."""
+
+    __tablename__ = "cache_entries"
+    __table_args__ = (db.Index("ix_cache_entries_stored_at", "stored_at"),)
+
+    namespace = db.Column(db.String(50), primary_key=True)
+    key = db.Column(db.String(200), primary_key=True)
+    value = db.Column(db.Text, nullable=False)  # JSON string of the cached value
+    size = db.Column(db.Integer, nullable=False)  # bytes of the JSON value
+    stored_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def get_value(self):
+        return json.loads(self.value)
+
+    def __repr__(self):
+        return f"<CacheEntry {self.namespace}:{self.key}>"
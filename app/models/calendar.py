@@ -1,22 +1,52 @@
 from app import db
 from datetime import datetime
+import json
 
 
 class CalendarEvent(db.Model):
     __tablename__ = "calendar_events"
+    __table_args__ = (
+        # Range reads are interval overlap queries
+        # (start_time < window_end AND end_time > window_start). Leading with
+        # end_time keeps them selective as past events accumulate.
+        db.Index("ix_calendar_events_end_start", "end_time", "start_time"),
+        db.Index(
+            "ix_calendar_events_calendar_end_start",
+            "calendar_id",
+            "end_time",
+            "start_time",
+        ),
+    )
 
     id = db.Column(db.String(100), primary_key=True)  # Google event ID
+    calendar_id = db.Column(
+        db.String(200), primary_key=True, default="primary"
+    )  # Google calendar ID (the same event can appear in several calendars)
     title = db.Column(db.String(200), nullable=False)
-    start_time = db.Column(db.DateTime, nullable=False)
-    end_time = db.Column(db.DateTime, nullable=False)
+    start_time = db.Column(db.DateTime, nullable=False)  # UTC
+    end_time = db.Column(db.DateTime, nullable=False)  # UTC
     category = db.Column(db.String(50), default="personal")
     description = db.Column(db.Text)
     recurring = db.Column(db.Boolean, default=False)
+    payload = db.Column(db.Text)  # JSON string of the Google Calendar event
+    etag = db.Column(db.String(100))  # Google etag (or content hash) of the payload
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
 
+    def set_payload(self, event):
+        self.payload = json.dumps(event)
+
+    def get_payload(self):
+        return json.loads(self.payload) if self.payload else None
+
+    @classmethod
+    def overlapping(cls, start, end):
+        """Filter for events overlapping the [start, end) window."""
+        return db.and_(cls.start_time < end, cls.end_time > start)
+
     def to_dict(self):
         return {
             "id": self.id,
+            "calendar_id": self.calendar_id,
             "title": self.title,
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat(),
@@ -28,3 +58,40 @@ class CalendarEvent(db.Model):
 
     def __repr__(self):
         return f"<CalendarEvent {self.title}>"
+
+
+class CalendarSyncState(db.Model):
+    __tablename__ = "calendar_sync_state"
+
+    calendar_id = db.Column(db.String(200), primary_key=True)
+    sync_token = db.Column(db.Text)  # nextSyncToken from the last successful sync
+    window_start = db.Column(db.DateTime)  # UTC range covered by the last full sync
+    window_end = db.Column(db.DateTime)
+    last_full_sync = db.Column(db.DateTime)
+    last_synced = db.Column(db.DateTime)
+
+    def covers(self, start, end):
+        """Check whether the last full sync covered the given range."""
+        return bool(
+            self.sync_token
+            and self.window_start
+            and self.window_end
+            and self.window_start <= start
+            and self.window_end >= end
+        )
+
+    def to_dict(self):
+        return {
+            "calendar_id": self.calendar_id,
+            "window_start": (
+                self.window_start.isoformat() if self.window_start else None
+            ),
+            "window_end": self.window_end.isoformat() if self.window_end else None,
+            "last_full_sync": (
+                self.last_full_sync.isoformat() if self.last_full_sync else None
+            ),
+            "last_synced": self.last_synced.isoformat() if self.last_synced else None,
+        }
+
+    def __repr__(self):
+        return f"<CalendarSyncState {self.calendar_id}>"
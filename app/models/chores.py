@@ -1,10 +1,14 @@
 from app import db
+from app.models.sheets import SheetMutation
 from datetime import datetime
 
 
 class Chore(db.Model):
     __tablename__ = "chores"
 
+    # Sheet column holding the completion checkbox (after Icon Name in E)
+    SHEET_COMPLETED_COLUMNS = "F:F"
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     assigned_to = db.Column(db.String(50), nullable=False)
@@ -15,9 +19,12 @@ class Chore(db.Model):
     completed_date = db.Column(db.DateTime)
     last_reset = db.Column(db.DateTime, default=datetime.utcnow)
     google_sheet_row = db.Column(db.Integer)
+    row_hash = db.Column(db.String(40))  # hash of the sheet row content
     created_date = db.Column(db.DateTime, default=datetime.utcnow)
 
     def to_dict(self):
+        from app.services.icon_variants import get_chore_icon
+
         return {
             "id": self.id,
             "name": self.name,
@@ -25,6 +32,7 @@ class Chore(db.Model):
             "frequency": self.frequency,
             "day_of_week": self.day_of_week,
             "icon_name": self.icon_name,
+            "icon": get_chore_icon(self.icon_name),  # display-sized variants
             "completed": self.completed,
             "completed_date": (
                 self.completed_date.isoformat() if self.completed_date else None
@@ -37,13 +45,25 @@ class Chore(db.Model):
     def mark_completed(self):
         self.completed = True
         self.completed_date = datetime.utcnow()
+        self._queue_sheet_update()
         db.session.commit()
 
     def reset_completion(self):
         self.completed = False
         self.completed_date = None
         self.last_reset = datetime.utcnow()
+        self._queue_sheet_update()
         db.session.commit()
 
+    def _queue_sheet_update(self):
+        # Chores only exist locally once synced from the sheet
+        if self.google_sheet_row:
+            SheetMutation.enqueue(
+                "chores",
+                self,
+                self.SHEET_COMPLETED_COLUMNS,
+                ["TRUE" if self.completed else "FALSE"],
+            )
+
     def __repr__(self):
         return f"<Chore {self.name} - {self.assigned_to}>"
@@ -0,0 +1,111 @@
+from app import db
+from datetime import datetime
+import json
+
+
+class SheetMutation(db.Model):
+    """A local chore or todo edit waiting to be written back to Google Sheets.
+
+    Edits to the same record are coalesced into one pending row holding the
+    latest cell values, so the flusher sends each record at most once. An
+    edit Sheets keeps rejecting is given up on (abandoned_at is set) after
+    SHEETS_MUTATION_MAX_ATTEMPTS tries and kept for inspection.
+    """
+
+    __tablename__ = "sheet_mutations"
+
+    id = db.Column(db.Integer, primary_key=True)
+    tab = db.Column(db.String(20), nullable=False)  # "chores" or "todos"
+    record_id = db.Column(db.Integer, index=True)  # None once the record is deleted
+    op = db.Column(db.String(10), nullable=False)  # "update" or "append"
+    sheet_row = db.Column(db.Integer)  # None for appends until a row is assigned
+    columns = db.Column(db.String(10), nullable=False)  # e.g. "F:F" or "A:E"
+    values = db.Column(db.Text, nullable=False)  # JSON list of cell values
+    version = db.Column(db.Integer, nullable=False, default=1)
+    attempts = db.Column(db.Integer, nullable=False, default=0)  # times rejected
+    last_error = db.Column(db.Text)
+    abandoned_at = db.Column(db.DateTime)  # set once no longer retried
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def get_values(self):
+        return json.loads(self.values)
+
+    @classmethod
+    def pending(cls):
+        """Query for the edits still waiting to be sent."""
+        return cls.query.filter(cls.abandoned_at.is_(None))
+
+    @classmethod
+    def enqueue(cls, tab, record, columns, values):
+        """Queue new cell values for a record, merging with a pending edit.
+
+        Added to the current session; the caller commits it together with
+        the local change.
+        """
+        pending = cls.query.filter_by(tab=tab, record_id=record.id).first()
+        if pending is not None and pending.columns == columns:
+            pending.values = json.dumps(values)
+            pending.version += 1
+            pending.updated_at = datetime.utcnow()
+            # New values may fix an edit that was given up on
+            pending.attempts = 0
+            pending.last_error = None
+            pending.abandoned_at = None
+            return pending
+
+        mutation = cls(
+            tab=tab,
+            record_id=record.id,
+            op="update" if record.google_sheet_row else "append",
+            sheet_row=record.google_sheet_row,
+            columns=columns,
+            values=json.dumps(values),
+        )
+        db.session.add(mutation)
+        return mutation
+
+    @classmethod
+    def enqueue_delete(cls, tab, record, columns):
+        """Queue clearing a deleted record's sheet row.
+
+        A pending edit that never reached the sheet is simply dropped.
+        """
+        cls.query.filter_by(tab=tab, record_id=record.id).delete(
+            synchronize_session=False
+        )
+        if not record.google_sheet_row:
+            return None
+
+        start, end = columns.split(":")
+        width = ord(end) - ord(start) + 1
+        mutation = cls(
+            tab=tab,
+            record_id=None,  # ids can be reused, so never merge into this one
+            op="update",
+            sheet_row=record.google_sheet_row,
+            columns=columns,
+            values=json.dumps([""] * width),
+        )
+        db.session.add(mutation)
+        return mutation
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "tab": self.tab,
+            "record_id": self.record_id,
+            "op": self.op,
+            "sheet_row": self.sheet_row,
+            "columns": self.columns,
+            "values": self.get_values(),
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "abandoned_at": (
+                self.abandoned_at.isoformat() if self.abandoned_at else None
+            ),
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def __repr__(self):
+        return f"<SheetMutation {self.tab} {self.op} row {self.sheet_row}>"
@@ -1,10 +1,14 @@
 from app import db
+from app.models.sheets import SheetMutation
 from datetime import datetime
 
 
 class Todo(db.Model):
     __tablename__ = "todos"
 
+    # Title, Priority, Assigned To, Due Date, Completed
+    SHEET_COLUMNS = "A:E"
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     priority = db.Column(db.Integer, nullable=False, default=5)  # 1-10 scale
@@ -13,6 +17,7 @@ class Todo(db.Model):
     completed = db.Column(db.Boolean, default=False)
     created_date = db.Column(db.DateTime, default=datetime.utcnow)
     google_sheet_row = db.Column(db.Integer)
+    row_hash = db.Column(db.String(40))  # hash of the sheet row content
 
     def to_dict(self):
         return {
@@ -28,7 +33,26 @@ class Todo(db.Model):
 
     def mark_completed(self):
         self.completed = True
+        self.queue_sheet_update()
         db.session.commit()
 
+    def sheet_values(self):
+        """The todo as a row of the Todos sheet."""
+        return [
+            self.title,
+            str(self.priority),
+            self.assigned_to or "",
+            self.due_date.isoformat() if self.due_date else "",
+            "TRUE" if self.completed else "FALSE",
+        ]
+
+    def queue_sheet_update(self):
+        """Queue writing this todo back to its sheet row (or a new one)."""
+        SheetMutation.enqueue("todos", self, self.SHEET_COLUMNS, self.sheet_values())
+
+    def queue_sheet_delete(self):
+        """Queue clearing this todo's sheet row."""
+        SheetMutation.enqueue_delete("todos", self, self.SHEET_COLUMNS)
+
     def __repr__(self):
         return f"<Todo {self.title} - Priority {self.priority}>"
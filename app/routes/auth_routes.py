@@ -9,7 +9,6 @@ from flask import (
 )
 from app.services.auth import GoogleAuthService
 from config import Config
-import os
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -79,14 +78,9 @@ def callback():
         flow.fetch_token(code=code)
         credentials = flow.credentials
 
-        # Save credentials
-        token_file = "credentials/token.json"
-        os.makedirs(os.path.dirname(token_file), exist_ok=True)
-
         # Save credentials with refresh_token if available
-        with open(token_file, "w") as token:
-            token.write(credentials.to_json())
-        
+        GoogleAuthService().save_credentials(credentials)
+
         # Log if refresh_token is missing (for debugging)
         if not credentials.refresh_token:
             print("Warning: No refresh_token received. Token will expire and require re-authentication.")
@@ -108,9 +102,7 @@ def logout():
     """Logout and clear credentials."""
     try:
         # Remove token file
-        token_file = "credentials/token.json"
-        if os.path.exists(token_file):
-            os.remove(token_file)
+        GoogleAuthService().clear_credentials()
 
         # Clear session
         session.clear()
@@ -1,5 +1,10 @@
-from flask import Blueprint, render_template, jsonify
-from app.services.google_calendar import GoogleCalendarService
+from flask import Blueprint, render_template, jsonify, request, current_app
+from app.services.google_calendar import (
+    GoogleCalendarService,
+    revalidate_window_in_background,
+)
+from app.services.maintenance import run_calendar_retention
+from config import Config
 from datetime import datetime, timedelta
 
 calendar_bp = Blueprint("calendar", __name__)
@@ -15,53 +20,86 @@ def calendar_view():
 def get_events():
     """Get calendar events for the current week."""
     try:
-        calendar_service = GoogleCalendarService()
-
-        # Get current week
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        start_of_week = today - timedelta(days=today.weekday())
-        end_of_week = start_of_week + timedelta(days=7)
-
-        events = calendar_service.get_events_from_all_calendars(
-            start_of_week, end_of_week
-        )
+        start_of_week, end_of_week = _get_week_bounds(0)
+        response = _get_week_events(start_of_week, end_of_week)
+        _prefetch_weeks([-1, 1])
 
-        return jsonify(
-            {
-                "success": True,
-                "events": events,
-                "week_start": start_of_week.isoformat(),
-                "week_end": end_of_week.isoformat(),
-            }
-        )
+        return jsonify(response)
 
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 
-@calendar_bp.route("/api/events/<int:week_offset>")
+@calendar_bp.route("/api/events/<int(signed=True):week_offset>")
 def get_events_by_week(week_offset):
     """Get calendar events for a specific week offset."""
     try:
-        calendar_service = GoogleCalendarService()
+        start_of_week, end_of_week = _get_week_bounds(week_offset)
+        response = _get_week_events(start_of_week, end_of_week)
+        _prefetch_weeks([week_offset - 1, week_offset + 1])
 
-        # Calculate week based on offset
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        start_of_week = (
-            today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
-        )
-        end_of_week = start_of_week + timedelta(days=7)
+        return jsonify(response)
 
-        events = calendar_service.get_events_from_all_calendars(
-            start_of_week, end_of_week
-        )
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@calendar_bp.route("/api/events/range")
+def get_events_range():
+    """Get calendar events for several consecutive weeks in one call.
+
+    Query parameters: start (week offset of the first week, default 0) and
+    weeks (number of weeks, default 1, at most CALENDAR_MAX_RANGE_WEEKS).
+    """
+    try:
+        start_offset = request.args.get("start", 0, type=int)
+        weeks = request.args.get("weeks", 1, type=int)
+        if weeks < 1 or weeks > Config.CALENDAR_MAX_RANGE_WEEKS:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": f"weeks must be between 1 and {Config.CALENDAR_MAX_RANGE_WEEKS}",
+                    }
+                ),
+                400,
+            )
+
+        week_offsets = range(start_offset, start_offset + weeks)
+        week_bounds = [_get_week_bounds(week_offset) for week_offset in week_offsets]
+
+        # Fetch the weeks never fetched before together instead of one by one
+        calendar_service = GoogleCalendarService()
+        missing = [
+            bounds
+            for bounds in week_bounds
+            if calendar_service.get_window_fetched_at(*bounds) is None
+        ]
+        if missing:
+            calendar_service.fetch_windows(missing)
+
+        results = [
+            _get_week_events(*bounds, fetch_missing=False) for bounds in week_bounds
+        ]
+        _prefetch_weeks([start_offset - 1, start_offset + weeks])
 
         return jsonify(
             {
                 "success": True,
-                "events": events,
-                "week_start": start_of_week.isoformat(),
-                "week_end": end_of_week.isoformat(),
+                "weeks": [
+                    {
+                        "week_offset": week_offset,
+                        "week_start": result["week_start"],
+                        "week_end": result["week_end"],
+                        "events": result["events"],
+                        "last_updated": result["last_updated"],
+                        "data_age": result["data_age"],
+                        "revalidating": result["revalidating"],
+                    }
+                    for week_offset, result in zip(week_offsets, results)
+                ],
+                "range_start": results[0]["week_start"],
+                "range_end": results[-1]["week_end"],
             }
         )
 
@@ -79,3 +117,78 @@ def get_calendars():
         return jsonify({"success": True, "calendars": calendars})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
+
+
+@calendar_bp.route("/api/cache/prune", methods=["POST"])
+def prune_cache():
+    """Prune cached events outside the retention window and compact the database."""
+    try:
+        report = run_calendar_retention()
+        return jsonify({"success": True, **report})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+def _get_week_bounds(week_offset):
+    """Get the start and end of the week week_offset weeks from the current one."""
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start_of_week = (
+        today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+    )
+    end_of_week = start_of_week + timedelta(days=7)
+    return start_of_week, end_of_week
+
+
+def _prefetch_weeks(week_offsets):
+    """Warm the local cache for weeks the user is likely to navigate to next."""
+    calendar_service = GoogleCalendarService()
+    app = current_app._get_current_object()
+
+    for week_offset in week_offsets:
+        start_of_week, end_of_week = _get_week_bounds(week_offset)
+        fetched_at = calendar_service.get_window_fetched_at(start_of_week, end_of_week)
+        if (
+            fetched_at is None
+            or (datetime.utcnow() - fetched_at).total_seconds()
+            > Config.CALENDAR_CACHE_TIMEOUT
+        ):
+            revalidate_window_in_background(app, start_of_week, end_of_week)
+
+
+def _get_week_events(start_of_week, end_of_week, fetch_missing=True):
+    """Serve a week from the local cache, revalidating it in the background when stale.
+
+    Only a week that has never been fetched waits on Google, and only with
+    fetch_missing.
+    """
+    calendar_service = GoogleCalendarService()
+    events, fetched_at = calendar_service.get_cached_window(start_of_week, end_of_week)
+
+    revalidating = False
+    if fetched_at is None and fetch_missing:
+        events = calendar_service.get_events_from_all_calendars(
+            start_of_week, end_of_week
+        )
+        fetched_at = calendar_service.get_window_fetched_at(start_of_week, end_of_week)
+    elif (
+        fetched_at is not None
+        and (datetime.utcnow() - fetched_at).total_seconds()
+        > Config.CALENDAR_CACHE_TIMEOUT
+    ):
+        revalidating = revalidate_window_in_background(
+            current_app._get_current_object(), start_of_week, end_of_week
+        )
+
+    return {
+        "success": True,
+        "events": events,
+        "week_start": start_of_week.isoformat(),
+        "week_end": end_of_week.isoformat(),
+        "last_updated": fetched_at.isoformat() if fetched_at else None,
+        "data_age": (
+            round((datetime.utcnow() - fetched_at).total_seconds())
+            if fetched_at
+            else None
+        ),
+        "revalidating": revalidating,
+    }
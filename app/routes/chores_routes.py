@@ -1,4 +1,5 @@
 from flask import Blueprint, render_template, jsonify, request
+from app.services.cache import get_cache
 from app.services.google_sheets import GoogleSheetsService
 from app.models.chores import Chore
 from app import db
@@ -17,10 +18,8 @@ def chores_view():
 def get_chores():
     """Get all chores."""
     try:
-        chores = Chore.query.all()
-        return jsonify(
-            {"success": True, "chores": [chore.to_dict() for chore in chores]}
-        )
+        chores = GoogleSheetsService().get_chores()
+        return jsonify({"success": True, "chores": chores})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -30,13 +29,22 @@ def sync_chores():
     """Sync chores from Google Sheets."""
     try:
         sheets_service = GoogleSheetsService()
-        chores = sheets_service.sync_chores_from_sheets()
+        chores = sheets_service.sync_chores_from_sheets(
+            force=request.args.get("force") == "true"
+        )
+        report = sheets_service.last_sync_report or {}
 
         return jsonify(
             {
                 "success": True,
                 "chores": [chore.to_dict() for chore in chores],
-                "message": f"Synced {len(chores)} chores from Google Sheets",
+                "message": (
+                    "Chores unchanged in Google Sheets"
+                    if report.get("skipped")
+                    else f"Synced {len(chores)} chores from Google Sheets"
+                ),
+                "skipped": report.get("skipped", False),
+                "changes": report,
             }
         )
     except Exception as e:
@@ -52,6 +60,7 @@ def complete_chore(chore_id):
             return jsonify({"success": False, "error": "Chore not found"}), 404
 
         chore.mark_completed()
+        get_cache().invalidate("chores")
 
         return jsonify({"success": True, "chore": chore.to_dict()})
     except Exception as e:
@@ -67,6 +76,7 @@ def reset_chores():
 
         for chore in chores_to_reset:
             chore.reset_completion()
+        get_cache().invalidate("chores")
 
         return jsonify(
             {
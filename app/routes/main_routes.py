@@ -1,7 +1,11 @@
-from flask import Blueprint, render_template, jsonify, redirect, url_for
+from flask import Blueprint, render_template, jsonify, redirect, request, url_for
 from app import db
-from app.models import CalendarEvent, Chore, Todo, WeatherData
+from app.models import CacheEntry, CalendarEvent, Chore, SheetMutation, Todo
+from app.services import circuit_breaker, http_session, quota, single_flight
+from app.services.cache import get_cache
 from app.services.auth import GoogleAuthService
+from app.services.google_sheets import GoogleSheetsService
+from app.services.scheduler import get_scheduler
 
 main_bp = Blueprint("main", __name__)
 
@@ -42,12 +46,63 @@ def health_check():
             "calendar_events": CalendarEvent.query.count(),
             "chores": Chore.query.count(),
             "todos": Todo.query.count(),
-            "weather_data": WeatherData.query.count(),
+            "cache_entries": CacheEntry.query.count(),
+            "sheet_mutations": SheetMutation.pending().count(),
+            "sheet_mutations_abandoned": SheetMutation.query.filter(
+                SheetMutation.abandoned_at.isnot(None)
+            ).count(),
         }
 
-        return jsonify({"status": "Online", "database": "Connected", "stats": stats})
+        return jsonify(
+            {
+                "status": "Online",
+                "database": "Connected",
+                "stats": stats,
+                "http": http_session.get_stats(),
+                "quota": quota.get_stats(),
+                "circuits": circuit_breaker.get_stats(),
+                "single_flight": single_flight.get_stats(),
+                "cache": get_cache().stats(),
+            }
+        )
     except Exception as e:
         return (
             jsonify({"status": "Offline", "database": "Disconnected", "error": str(e)}),
             500,
         )
+
+
+@main_bp.route("/api/scheduler")
+def scheduler_status():
+    """Show the last run, duration and error of each background refresh job."""
+    scheduler = get_scheduler()
+    if not scheduler:
+        return jsonify({"success": True, "enabled": False, "jobs": {}})
+
+    return jsonify({"success": True, "enabled": True, "jobs": scheduler.status()})
+
+
+@main_bp.route("/api/sheets/sync", methods=["POST"])
+def sync_sheets():
+    """Sync chores and todos from Google Sheets in one request."""
+    try:
+        sheets_service = GoogleSheetsService()
+        chores, todos = sheets_service.sync_all_from_sheets(
+            force=request.args.get("force") == "true"
+        )
+        reports = sheets_service.last_sync_report or {}
+
+        return jsonify(
+            {
+                "success": True,
+                "chores": [chore.to_dict() for chore in chores],
+                "todos": [todo.to_dict() for todo in todos],
+                "skipped": {
+                    name: report.get("skipped", False)
+                    for name, report in reports.items()
+                },
+                "changes": reports,
+            }
+        )
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
@@ -1,4 +1,5 @@
 from flask import Blueprint, render_template, jsonify, request
+from app.services.cache import get_cache
 from app.services.google_sheets import GoogleSheetsService
 from app.models.todos import Todo
 from app import db
@@ -17,8 +18,8 @@ def todos_view():
 def get_todos():
     """Get all todos, sorted by priority."""
     try:
-        todos = Todo.query.order_by(Todo.priority.desc(), Todo.created_date.asc()).all()
-        return jsonify({"success": True, "todos": [todo.to_dict() for todo in todos]})
+        todos = GoogleSheetsService().get_todos()
+        return jsonify({"success": True, "todos": todos})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -28,13 +29,22 @@ def sync_todos():
     """Sync todos from Google Sheets."""
     try:
         sheets_service = GoogleSheetsService()
-        todos = sheets_service.sync_todos_from_sheets()
+        todos = sheets_service.sync_todos_from_sheets(
+            force=request.args.get("force") == "true"
+        )
+        report = sheets_service.last_sync_report or {}
 
         return jsonify(
             {
                 "success": True,
                 "todos": [todo.to_dict() for todo in todos],
-                "message": f"Synced {len(todos)} todos from Google Sheets",
+                "message": (
+                    "Todos unchanged in Google Sheets"
+                    if report.get("skipped")
+                    else f"Synced {len(todos)} todos from Google Sheets"
+                ),
+                "skipped": report.get("skipped", False),
+                "changes": report,
             }
         )
     except Exception as e:
@@ -50,6 +60,7 @@ def complete_todo(todo_id):
             return jsonify({"success": False, "error": "Todo not found"}), 404
 
         todo.mark_completed()
+        get_cache().invalidate("todos")
 
         return jsonify({"success": True, "todo": todo.to_dict()})
     except Exception as e:
@@ -64,7 +75,7 @@ def create_todo():
 
         todo = Todo(
             title=data.get("title", ""),
-            description=data.get("description", ""),
+            assigned_to=data.get("assigned_to") or None,
             priority=int(data.get("priority", 5)),
             due_date=(
                 datetime.strptime(data["due_date"], "%Y-%m-%d").date()
@@ -74,7 +85,10 @@ def create_todo():
         )
 
         db.session.add(todo)
+        db.session.flush()  # assign the id the queued sheet write refers to
+        todo.queue_sheet_update()
         db.session.commit()
+        get_cache().invalidate("todos")
 
         return jsonify({"success": True, "todo": todo.to_dict()})
     except Exception as e:
@@ -93,8 +107,8 @@ def update_todo(todo_id):
 
         if "title" in data:
             todo.title = data["title"]
-        if "description" in data:
-            todo.description = data["description"]
+        if "assigned_to" in data:
+            todo.assigned_to = data["assigned_to"] or None
         if "priority" in data:
             todo.priority = int(data["priority"])
         if "due_date" in data:
@@ -104,7 +118,9 @@ def update_todo(todo_id):
                 else None
             )
 
+        todo.queue_sheet_update()
         db.session.commit()
+        get_cache().invalidate("todos")
 
         return jsonify({"success": True, "todo": todo.to_dict()})
     except Exception as e:
@@ -119,8 +135,10 @@ def delete_todo(todo_id):
         if not todo:
             return jsonify({"success": False, "error": "Todo not found"}), 404
 
+        todo.queue_sheet_delete()
         db.session.delete(todo)
         db.session.commit()
+        get_cache().invalidate("todos")
 
         return jsonify({"success": True, "message": "Todo deleted successfully"})
     except Exception as e:
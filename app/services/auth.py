@@ -1,50 +1,264 @@
 import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from config import Config
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fcntl is unavailable on Windows
+    fcntl = None
+
+TOKEN_FILE = "credentials/token.json"
+
+# Refresh the access token this long before it expires
+REFRESH_MARGIN = timedelta(minutes=5)
+# Wait this long before retrying a failed refresh
+REFRESH_RETRY_SECONDS = 60
+
+
+class CredentialStore:
+    """Process-wide, in-memory cache of the credentials stored in token.json.
+
+    The token file is only re-read when its modification time changes, and the
+    access token is refreshed on a background timer shortly before it expires.
+    """
+
+    def __init__(self, token_file, scopes):
+        self.token_file = token_file
+        self.scopes = scopes
+        self.generation = 0  # Bumped whenever a different credentials object is loaded
+        self._lock = threading.RLock()
+        # Serializes refreshes; held during the network call instead of _lock
+        self._refresh_lock = threading.Lock()
+        self._creds = None
+        self._mtime = None
+        self._refresh_timer = None
+        self._refresh_failed_at = None
+
+    def get(self):
+        """Return the cached credentials, reloading them if token.json changed.
+
+        Returns None while an expired token cannot be refreshed; the loaded
+        credentials are kept so the refresh is retried.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            creds = self._creds
+
+        # Only refresh inline if the token has already expired (e.g. the Pi
+        # was suspended past the scheduled refresh); normally the background
+        # timer keeps the token fresh and requests never wait on a refresh.
+        if creds and creds.expired and not self._refresh(inline=True):
+            return None
+
+        with self._lock:
+            return self._creds
+
+    def save(self, creds):
+        """Persist new credentials (e.g. after the OAuth callback) and cache them."""
+        # The file lock is always taken before _lock, as in _refresh
+        with self._file_lock(), self._lock:
+            self._write(creds, locked=True)
+            self._refresh_failed_at = None
+            self._set_credentials(creds)
+
+    def clear(self):
+        """Forget the cached credentials and remove token.json."""
+        with self._file_lock(), self._lock:
+            if os.path.exists(self.token_file):
+                os.remove(self.token_file)
+            self._mtime = None
+            self._set_credentials(None)
+
+    def _reload_if_changed(self):
+        """Re-read token.json if it was created, replaced or removed."""
+        try:
+            mtime = os.stat(self.token_file).st_mtime_ns
+        except FileNotFoundError:
+            if self._mtime is not None or self._creds is not None:
+                self._mtime = None
+                self._set_credentials(None)
+            return
+
+        if mtime == self._mtime:
+            return
+
+        self._mtime = mtime
+        creds = None
+        try:
+            creds = Credentials.from_authorized_user_file(self.token_file, self.scopes)
+            if creds.expired and not creds.refresh_token:
+                # No refresh_token available - credentials need to be re-authorized
+                print(
+                    "Credentials expired and no refresh_token available. Re-authentication required."
+                )
+                creds = None
+        except Exception as e:
+            print(f"Failed to load credentials: {e}")
+            # If the error is about missing refresh_token, provide helpful message
+            if "refresh_token" in str(e).lower():
+                print(
+                    "Token file is missing refresh_token. Please re-authenticate at /auth/login"
+                )
+
+        self._set_credentials(creds)
+
+    def _set_credentials(self, creds):
+        if creds is not self._creds:
+            self.generation += 1
+        self._creds = creds
+        self._schedule_refresh()
+
+    def _schedule_refresh(self, delay=None):
+        """Arm a timer that refreshes the token ahead of its expiry."""
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+        creds = self._creds
+        if not creds or not creds.refresh_token:
+            return
+
+        if delay is None:
+            if not creds.expiry:
+                return
+            refresh_at = creds.expiry - REFRESH_MARGIN
+            delay = max(0, (refresh_at - datetime.utcnow()).total_seconds())
+
+        self._refresh_timer = threading.Timer(delay, self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _background_refresh(self):
+        self._refresh()
+
+    def _refresh(self, inline=False):
+        """Refresh the cached credentials and write them back to token.json.
+
+        The network call runs outside _lock so requests are never blocked by
+        it. A failed refresh is retried by the timer after
+        REFRESH_RETRY_SECONDS; inline refreshes are not attempted meanwhile.
+        """
+        started = time.monotonic()
+        try:
+            with self._refresh_lock, self._file_lock():
+                # Another thread or process may have refreshed the token while
+                # we waited for the lock; adopt its token instead of refreshing.
+                with self._lock:
+                    self._reload_if_changed()
+                    creds = self._creds
+                    failed_at = self._refresh_failed_at
+                if failed_at and (
+                    failed_at >= started
+                    or (inline and started - failed_at < REFRESH_RETRY_SECONDS)
+                ):
+                    return False  # it failed recently; leave it to the retry
+                if not creds or not creds.refresh_token:
+                    return False
+                if creds.expiry and not self._expires_soon(creds):
+                    return True
+
+                creds.refresh(Request())
+                with self._lock:
+                    self._write(creds, locked=True)
+                    self._refresh_failed_at = None
+                    self._schedule_refresh()
+            return True
+        except Exception as e:
+            print(f"Failed to refresh credentials: {e}")
+            with self._lock:
+                self._refresh_failed_at = time.monotonic()
+                self._schedule_refresh(REFRESH_RETRY_SECONDS)
+            return False
+
+    def _write(self, creds, locked=False):
+        """Atomically replace token.json, serialized under the token file lock.
+
+        Callers holding _lock must take the file lock first and pass locked.
+        """
+        directory = os.path.dirname(self.token_file) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        with self._file_lock(enabled=not locked):
+            fd, tmp_path = tempfile.mkstemp(
+                dir=directory, prefix=".token-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as token:
+                    token.write(creds.to_json())
+                    token.flush()
+                    os.fsync(token.fileno())
+                os.replace(tmp_path, self.token_file)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            self._mtime = os.stat(self.token_file).st_mtime_ns
+
+    @contextmanager
+    def _file_lock(self, enabled=True):
+        """Hold an exclusive lock shared by every process writing token.json."""
+        if not enabled or fcntl is None:
+            yield
+            return
+
+        directory = os.path.dirname(self.token_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{self.token_file}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _expires_soon(creds):
+        return creds.expiry - REFRESH_MARGIN <= datetime.utcnow()
+
+
+_credential_stores = {}
+_credential_stores_lock = threading.Lock()
+
+
+def get_credential_store(token_file=TOKEN_FILE, scopes=None):
+    """Return the process-wide credential store for a token file."""
+    with _credential_stores_lock:
+        store = _credential_stores.get(token_file)
+        if store is None:
+            store = CredentialStore(token_file, scopes or Config.GOOGLE_SCOPES)
+            _credential_stores[token_file] = store
+        return store
+
 
 class GoogleAuthService:
     def __init__(self):
         self.scopes = Config.GOOGLE_SCOPES
         self.credentials_file = Config.GOOGLE_CREDENTIALS_FILE
-        self.token_file = "credentials/token.json"
+        self.token_file = TOKEN_FILE
+        self.store = get_credential_store(self.token_file, self.scopes)
 
     def get_credentials(self):
-        """Get valid user credentials from storage."""
-        creds = None
-
-        # Load existing token
-        if os.path.exists(self.token_file):
-            try:
-                creds = Credentials.from_authorized_user_file(
-                    self.token_file, self.scopes
-                )
+        """Get valid user credentials from the shared credential store."""
+        try:
+            return self.store.get()
+        except Exception as e:
+            print(f"Failed to load credentials: {e}")
+            return None
 
-                # If credentials are expired, try to refresh if refresh_token exists
-                if creds and creds.expired:
-                    if creds.refresh_token:
-                        try:
-                            creds.refresh(Request())
-                            # Save refreshed credentials
-                            with open(self.token_file, "w") as token:
-                                token.write(creds.to_json())
-                        except Exception as e:
-                            print(f"Failed to refresh credentials: {e}")
-                            creds = None
-                    else:
-                        # No refresh_token available - credentials need to be re-authorized
-                        print("Credentials expired and no refresh_token available. Re-authentication required.")
-                        creds = None
-            except Exception as e:
-                print(f"Failed to load credentials: {e}")
-                # If the error is about missing refresh_token, provide helpful message
-                if "refresh_token" in str(e).lower():
-                    print("Token file is missing refresh_token. Please re-authenticate at /auth/login")
-                creds = None
+    def save_credentials(self, creds):
+        """Store newly authorized credentials."""
+        self.store.save(creds)
 
-        return creds
+    def clear_credentials(self):
+        """Remove stored credentials."""
+        self.store.clear()
 
     def is_authenticated(self):
         """Check if user is authenticated."""
@@ -0,0 +1,213 @@
+import json
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from app.models.cache import CacheEntry
+from app import db
+from config import Config
+
+CachedValue = namedtuple("CachedValue", ["value", "stored_at", "expires_at"])
+
+
+class TwoTierCache:
+    """Bounded in-memory LRU in front of a persistent SQLite table.
+
+    Each namespace gets its timeout, and whether it is persisted, from
+    CACHE_NAMESPACES (CACHE_DEFAULT_TIMEOUT and persisted otherwise).
+    Expired entries are kept so callers can fall back to stale data when
+    an upstream is unavailable; both tiers evict by size instead, the
+    memory tier least recently used first and the SQLite tier oldest first.
+
+    Values must be JSON serializable, and values returned from the memory
+    tier are shared, so callers must not modify them.
+    """
+
+    def __init__(self, memory_max_bytes, db_max_bytes):
+        self.memory_max_bytes = memory_max_bytes
+        self.db_max_bytes = db_max_bytes
+        self._memory = OrderedDict()  # (namespace, key) -> (CachedValue, size)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "invalidations": 0,
+            "memory_evictions": 0,
+            "db_evictions": 0,
+        }
+
+    def get(self, namespace, key, allow_stale=False):
+        """Get a cached value, or None if it is missing or expired.
+
+        With allow_stale, expired values are returned too.
+        """
+        entry = self.get_entry(namespace, key)
+        if entry is None:
+            return None
+        if entry.expires_at <= datetime.utcnow():
+            if not allow_stale:
+                return None
+            self._count("stale_hits")
+        return entry.value
+
+    def get_entry(self, namespace, key):
+        """Get a CachedValue with its timestamps regardless of age, or None."""
+        with self._lock:
+            cached = self._memory.get((namespace, key))
+            if cached is not None:
+                self._memory.move_to_end((namespace, key))
+                self._stats["memory_hits"] += 1
+                return cached[0]
+
+        if self._namespace(namespace)["persistent"]:
+            try:
+                row = db.session.get(CacheEntry, (namespace, key))
+                if row is not None:
+                    entry = CachedValue(row.get_value(), row.stored_at, row.expires_at)
+                    self._remember(namespace, key, entry, row.size)
+                    self._count("db_hits")
+                    return entry
+            except Exception as e:
+                print(f"Error reading cache entry {namespace}:{key}: {e}")
+
+        self._count("misses")
+        return None
+
+    def set(self, namespace, key, value, timeout=None):
+        """Cache a value for `timeout` seconds (default: the namespace timeout)."""
+        settings = self._namespace(namespace)
+        if timeout is None:
+            timeout = settings["timeout"]
+
+        payload = json.dumps(value)
+        size = len(payload)
+        now = datetime.utcnow()
+        entry = CachedValue(value, now, now + timedelta(seconds=timeout))
+
+        self._remember(namespace, key, entry, size)
+        self._count("sets")
+
+        if settings["persistent"]:
+            try:
+                db.session.merge(
+                    CacheEntry(
+                        namespace=namespace,
+                        key=key,
+                        value=payload,
+                        size=size,
+                        stored_at=entry.stored_at,
+                        expires_at=entry.expires_at,
+                    )
+                )
+                db.session.commit()
+                self._evict_db()
+            except Exception as e:
+                print(f"Error writing cache entry {namespace}:{key}: {e}")
+                db.session.rollback()
+
+    def invalidate(self, namespace, key=None):
+        """Drop one key, or the whole namespace, from both tiers."""
+        with self._lock:
+            for cache_key in list(self._memory):
+                if cache_key[0] == namespace and key in (None, cache_key[1]):
+                    _, size = self._memory.pop(cache_key)
+                    self._memory_bytes -= size
+            self._stats["invalidations"] += 1
+
+        if self._namespace(namespace)["persistent"]:
+            try:
+                query = CacheEntry.query.filter_by(namespace=namespace)
+                if key is not None:
+                    query = query.filter_by(key=key)
+                query.delete(synchronize_session=False)
+                db.session.commit()
+            except Exception as e:
+                print(f"Error invalidating cache {namespace}: {e}")
+                db.session.rollback()
+
+    def keys(self, namespace):
+        """Keys cached in a namespace, in either tier."""
+        with self._lock:
+            keys = {key for cache_ns, key in self._memory if cache_ns == namespace}
+
+        if self._namespace(namespace)["persistent"]:
+            try:
+                rows = db.session.query(CacheEntry.key).filter_by(namespace=namespace)
+                keys.update(key for (key,) in rows)
+            except Exception as e:
+                print(f"Error listing cache {namespace}: {e}")
+        return keys
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self):
+        """Hit, miss and eviction counters plus the memory tier's size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+        return stats
+
+    def _namespace(self, namespace):
+        settings = Config.CACHE_NAMESPACES.get(namespace, {})
+        return {
+            "timeout": settings.get("timeout", Config.CACHE_DEFAULT_TIMEOUT),
+            "persistent": settings.get("persistent", True),
+        }
+
+    def _remember(self, namespace, key, entry, size):
+        cache_key = (namespace, key)
+        with self._lock:
+            previous = self._memory.pop(cache_key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[1]
+            if size > self.memory_max_bytes:
+                return
+
+            self._memory[cache_key] = (entry, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_max_bytes:
+                _, (_, evicted_size) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted_size
+                self._stats["memory_evictions"] += 1
+
+    def _evict_db(self):
+        total = db.session.query(func.sum(CacheEntry.size)).scalar() or 0
+        if total <= self.db_max_bytes:
+            return
+
+        evicted = 0
+        for row in CacheEntry.query.order_by(CacheEntry.stored_at).all():
+            if total <= self.db_max_bytes:
+                break
+            total -= row.size
+            db.session.delete(row)
+            evicted += 1
+        db.session.commit()
+        self._count("db_evictions", evicted)
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TwoTierCache(
+                Config.CACHE_MEMORY_MAX_BYTES, Config.CACHE_DB_MAX_BYTES
+            )
+        return _cache
@@ -0,0 +1,120 @@
+import threading
+import time
+from datetime import datetime
+from config import Config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name):
+        super().__init__(f"Circuit open for {name}, using cached data")
+        self.name = name
+
+
+class CircuitBreaker:
+    """Stops calling an upstream after consecutive failures.
+
+    After `failure_threshold` failures in a row the circuit opens and calls
+    fail immediately. Once `reset_timeout` seconds have passed it goes
+    half-open and lets `half_open_max_calls` trial calls through: a success
+    closes it again, a failure reopens it.
+    """
+
+    def __init__(self, name, failure_threshold, reset_timeout, half_open_max_calls=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.open_count = 0
+        self.rejected = 0
+        self.last_error = None
+        self._opened_monotonic = None
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpen unless a call may go through now."""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_monotonic < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name)
+                self.state = HALF_OPEN
+                self._trials = 0
+
+            if self.state == HALF_OPEN:
+                if self._trials >= self.half_open_max_calls:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name)
+                self._trials += 1
+
+    def release(self):
+        """Give back a half-open trial slot for a call that was never made."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"Circuit for {self.name} closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._trials = 0
+
+    def record_failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.open_count += 1
+                    print(f"Circuit for {self.name} opened: {error}")
+                self.state = OPEN
+                self.opened_at = datetime.utcnow()
+                self._opened_monotonic = time.monotonic()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "opened_at": self.opened_at.isoformat() if self.opened_at else None,
+                "open_count": self.open_count,
+                "rejected": self.rejected,
+                "last_error": self.last_error,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """Return the circuit breaker for an upstream, creating it on first use."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                Config.CIRCUIT_FAILURE_THRESHOLD,
+                Config.CIRCUIT_RESET_TIMEOUT,
+                Config.CIRCUIT_HALF_OPEN_MAX_CALLS,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def get_stats():
+    """State of every circuit breaker used so far."""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.to_dict() for name, breaker in breakers.items()}
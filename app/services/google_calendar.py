@@ -1,11 +1,80 @@
-from datetime import datetime, timedelta
-from googleapiclient.discovery import build
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from googleapiclient.errors import HttpError
+from sqlalchemy import or_
 from .auth import GoogleAuthService
-from app.models.calendar import CalendarEvent
+from .google_clients import get_google_client
+from . import single_flight, upstream
+from .cache import get_cache
+from app.models.calendar import CalendarEvent, CalendarSyncState
 from app import db
 from config import Config
 
 
+# Cache namespace holding, per window outside the sync range, when each
+# calendar's events in it were last fetched from Google
+WINDOW_FETCHES = "calendar_windows"
+
+
+def _window_key(start_date, end_date):
+    return f"{start_date.isoformat()}|{end_date.isoformat()}"
+
+
+def forget_window_fetches(oldest, newest):
+    """Forget fetch times of windows reaching outside [oldest, newest].
+
+    Called after their cached rows have been pruned so they get refetched.
+    """
+    cache = get_cache()
+    for key in cache.keys(WINDOW_FETCHES):
+        start_date, end_date = (datetime.fromisoformat(part) for part in key.split("|"))
+        if start_date < oldest or end_date > newest:
+            cache.invalidate(WINDOW_FETCHES, key)
+
+
+# Shared by every fetch so its threads, and the HTTP connection each keeps
+# open, are reused instead of reconnecting on every sync
+_fetch_executor = ThreadPoolExecutor(
+    max_workers=max(1, Config.CALENDAR_FETCH_WORKERS),
+    thread_name_prefix="calendar-fetch",
+)
+
+# Windows currently being revalidated in the background
+_revalidating_windows = set()
+_revalidating_lock = threading.Lock()
+
+
+def revalidate_window_in_background(app, start_date, end_date):
+    """Refresh a cached window from Google on a background thread.
+
+    Does nothing if the window is already being revalidated. Returns True
+    while a revalidation of the window is in progress.
+    """
+    key = (start_date, end_date)
+    with _revalidating_lock:
+        if key in _revalidating_windows:
+            return True
+        _revalidating_windows.add(key)
+
+    def revalidate():
+        try:
+            with app.app_context():
+                GoogleCalendarService().get_events_from_all_calendars(
+                    start_date, end_date
+                )
+        except Exception as e:
+            print(f"Error revalidating calendar window: {e}")
+        finally:
+            with _revalidating_lock:
+                _revalidating_windows.discard(key)
+
+    threading.Thread(target=revalidate, daemon=True).start()
+    return True
+
+
 class GoogleCalendarService:
     def __init__(self):
         self.auth_service = GoogleAuthService()
@@ -15,8 +84,7 @@ class GoogleCalendarService:
     def _initialize_service(self):
         """Initialize the Google Calendar service."""
         try:
-            creds = self.auth_service.get_credentials()
-            self.service = build("calendar", "v3", credentials=creds)
+            self.service = get_google_client("calendar", "v3")
         except Exception as e:
             print(f"Error initializing Google Calendar service: {e}")
             self.service = None
@@ -40,19 +108,7 @@ class GoogleCalendarService:
             end_str = end_date.isoformat() + "Z"
 
             # Call the Calendar API
-            events_result = (
-                self.service.events()
-                .list(
-                    calendarId="primary",
-                    timeMin=start_str,
-                    timeMax=end_str,
-                    singleEvents=True,
-                    orderBy="startTime",
-                )
-                .execute()
-            )
-
-            events = events_result.get("items", [])
+            events = self._fetch_calendar_events("primary", start_str, end_str)
 
             # Add calendar info to each event
             for event in events:
@@ -61,7 +117,7 @@ class GoogleCalendarService:
                 event["calendar_color"] = "1"  # Default blue for primary
 
             # Cache events in local database
-            self._cache_events(events)
+            self._cache_events(events, start_date, end_date, ["primary"])
 
             return events
 
@@ -69,13 +125,41 @@ class GoogleCalendarService:
             print(f"Error fetching calendar events: {e}")
             return self._get_cached_events(start_date, end_date)
 
-    def get_calendars(self):
-        """Get list of all accessible calendars."""
+    def get_calendars(self, refresh=False):
+        """Get list of all accessible calendars.
+
+        Served from the calendar_list cache namespace; the calendarList API
+        is only called once the cache is older than CALENDAR_LIST_CACHE_TIMEOUT.
+        """
+        cache = get_cache()
+        if not refresh:
+            calendars = cache.get("calendar_list", "all")
+            if calendars is not None:
+                return calendars
+
+        calendars = single_flight.do(("calendar_list",), self._refresh_calendars)
+        if calendars is None:
+            # Fall back to stale metadata rather than losing calendar names
+            return cache.get("calendar_list", "all", allow_stale=True) or []
+
+        return calendars
+
+    def _refresh_calendars(self):
+        """Fetch the calendar list and cache it, or return None."""
+        calendars = self._fetch_calendars()
+        if calendars is not None:
+            get_cache().set("calendar_list", "all", calendars)
+        return calendars
+
+    def _fetch_calendars(self):
+        """Fetch accessible calendars from Google, or None if that fails."""
         if not self.service:
-            return []
+            return None
 
         try:
-            calendar_list = self.service.calendarList().list().execute()
+            calendar_list = upstream.execute(
+                "google_calendar", self.service.calendarList().list()
+            )
             calendars = calendar_list.get("items", [])
 
             # Filter out calendars that are not accessible for reading events
@@ -94,125 +178,423 @@ class GoogleCalendarService:
             return accessible_calendars
         except Exception as e:
             print(f"Error fetching calendar list: {e}")
-            return []
+            return None
 
     def get_events_from_all_calendars(self, start_date=None, end_date=None):
-        """Get events from all accessible calendars."""
+        """Get events from all accessible calendars.
+
+        Concurrent requests for the same window share one fetch.
+        """
         if not self.service:
             return []
 
+        # Default to current week if no dates provided
+        if not start_date:
+            start_date = datetime.now().replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+        if not end_date:
+            end_date = start_date + timedelta(days=7)
+
+        events = single_flight.do(
+            ("calendar_events", start_date, end_date),
+            self._load_events_from_all_calendars,
+            start_date,
+            end_date,
+        )
+        # Each caller gets its own list of the shared events
+        return list(events)
+
+    def _load_events_from_all_calendars(self, start_date, end_date):
         try:
-            # Default to current week if no dates provided
-            if not start_date:
-                start_date = datetime.now().replace(
-                    hour=0, minute=0, second=0, microsecond=0
+            # Get all accessible calendars
+            calendars = self.get_calendars()
+            calendar_ids = self._selected_calendar_ids(calendars)
+
+            # Windows inside the sync range are served from the incrementally
+            # synced local copy; anything else is fetched from Google directly
+            sync_start, sync_end = self._get_sync_window()
+            if start_date >= sync_start and end_date <= sync_end:
+                self.sync_calendars(calendar_ids, calendars)
+                all_events = self._get_synced_events(calendar_ids, start_date, end_date)
+            else:
+                all_events = self._fetch_window(
+                    calendar_ids, start_date, end_date, calendars
                 )
-            if not end_date:
-                end_date = start_date + timedelta(days=7)
 
-            # Format dates for Google Calendar API
-            start_str = start_date.isoformat() + "Z"
-            end_str = end_date.isoformat() + "Z"
+            self._annotate_events(all_events, calendars)
 
-            all_events = []
+            # Sort all events by start time
+            all_events.sort(key=self._event_sort_key)
 
-            # Get all accessible calendars
+            return all_events
+
+        except Exception as e:
+            print(f"Error fetching calendar events: {e}")
+            return self._get_cached_events(start_date, end_date)
+
+    def fetch_windows(self, windows):
+        """Fetch several (start, end) windows from Google in one go.
+
+        Windows inside the sync range are brought up to date with one sync;
+        those before or after it are fetched as the span covering them, with
+        one request per calendar, and each is recorded as fetched on its own.
+        """
+        if not self.service or not windows:
+            return
+
+        single_flight.do(
+            ("calendar_windows", tuple(windows)), self._fetch_windows, windows
+        )
+
+    def _fetch_windows(self, windows):
+        try:
             calendars = self.get_calendars()
-            calendar_ids = [cal["id"] for cal in calendars if cal["selected"]]
+            calendar_ids = self._selected_calendar_ids(calendars)
+
+            sync_start, sync_end = self._get_sync_window()
+            in_sync = [
+                window
+                for window in windows
+                if window[0] >= sync_start and window[1] <= sync_end
+            ]
+            if in_sync:
+                self.sync_calendars(calendar_ids, calendars)
+
+            before = [window for window in windows if window[0] < sync_start]
+            after = [
+                window
+                for window in windows
+                if window[0] >= sync_start and window not in in_sync
+            ]
+            for outside in (before, after):
+                if outside:
+                    self._fetch_window(
+                        calendar_ids,
+                        min(window[0] for window in outside),
+                        max(window[1] for window in outside),
+                        calendars,
+                        windows=outside,
+                    )
 
-            # If no calendars found, fall back to primary
-            if not calendar_ids:
-                calendar_ids = ["primary"]
+        except Exception as e:
+            print(f"Error fetching calendar events: {e}")
 
-            # Fetch events from each calendar
-            for calendar_id in calendar_ids:
+    def _selected_calendar_ids(self, calendars):
+        calendar_ids = [cal["id"] for cal in calendars if cal["selected"]]
+
+        # If no calendars found, fall back to primary
+        return calendar_ids or ["primary"]
+
+    def get_cached_window(self, start_date, end_date):
+        """Get cached events for a window without contacting Google.
+
+        Returns the events, in the same shape as live data, and the time the
+        window was last fetched from Google (None if it never was).
+        """
+        return (
+            self._get_cached_events(start_date, end_date),
+            self.get_window_fetched_at(start_date, end_date),
+        )
+
+    def get_window_fetched_at(self, start_date, end_date):
+        """Get when the cached copy of a window was last refreshed from Google."""
+        sync_start, sync_end = self._get_sync_window()
+        if start_date >= sync_start and end_date <= sync_end:
+            synced = [
+                state.last_synced
+                for state in CalendarSyncState.query.all()
+                if state.covers(sync_start, sync_end) and state.last_synced
+            ]
+            return max(synced) if synced else None
+
+        fetched = get_cache().get(
+            WINDOW_FETCHES, _window_key(start_date, end_date), allow_stale=True
+        )
+        if not fetched:
+            return None
+        # The window is as fresh as its least recently fetched calendar
+        return min(datetime.fromisoformat(value) for value in fetched.values())
+
+    def sync_calendars(self, calendar_ids, calendars=None):
+        """Incrementally sync calendars into the local database using sync tokens.
+
+        Only events changed or deleted since the last sync are downloaded.
+        Calendars without a usable sync token, or whose token Google has
+        expired (HTTP 410), get a full resync of the sync window instead.
+        """
+        # Overlapping requests share one sync of the same calendars
+        single_flight.do(
+            ("calendar_sync", tuple(sorted(calendar_ids))),
+            self._sync_calendars,
+            calendar_ids,
+            calendars,
+        )
+
+    def _sync_calendars(self, calendar_ids, calendars):
+        sync_start, sync_end = self._get_sync_window()
+        states = {
+            state.calendar_id: state
+            for state in CalendarSyncState.query.filter(
+                CalendarSyncState.calendar_id.in_(calendar_ids)
+            ).all()
+        }
+        sync_tokens = {
+            calendar_id: state.sync_token
+            for calendar_id, state in states.items()
+            if state.covers(sync_start, sync_end)
+        }
+
+        def fetch(calendar_id):
+            sync_token = sync_tokens.get(calendar_id)
+            if sync_token:
                 try:
-                    events_result = (
-                        self.service.events()
-                        .list(
-                            calendarId=calendar_id,
-                            timeMin=start_str,
-                            timeMax=end_str,
-                            singleEvents=True,
-                            orderBy="startTime",
-                        )
-                        .execute()
+                    events, next_sync_token = self._list_all_events(
+                        calendar_id, syncToken=sync_token
                     )
+                    return False, events, next_sync_token
+                except HttpError as e:
+                    if e.resp.status != 410:
+                        raise
+                    print(f"Sync token expired for calendar {calendar_id}, resyncing")
+
+            events, next_sync_token = self._list_all_events(
+                calendar_id,
+                timeMin=sync_start.isoformat() + "Z",
+                timeMax=sync_end.isoformat() + "Z",
+            )
+            return True, events, next_sync_token
 
-                    events = events_result.get("items", [])
-                    # Add calendar info to each event
-                    for event in events:
-                        event["calendar_id"] = calendar_id
-                        # Find calendar name and color
-                        calendar_name = "Primary"
-                        calendar_color = "1"  # Default blue
-                        if calendar_id != "primary":
-                            for cal in calendars:
-                                if cal["id"] == calendar_id:
-                                    calendar_name = cal["summary"]
-                                    calendar_color = cal["color"]
-                                    break
-                        event["calendar_name"] = calendar_name
-                        event["calendar_color"] = calendar_color
-
-                    all_events.extend(events)
-                except Exception as e:
-                    print(f"Error fetching events from calendar {calendar_id}: {e}")
-                    continue
+        results = self._fetch_concurrently(calendar_ids, fetch)
 
-            # Sort all events by start time
-            all_events.sort(
-                key=lambda x: x.get("start", {}).get(
-                    "dateTime", x.get("start", {}).get("date", "")
-                )
+        for calendar_id, (full_sync, events, next_sync_token) in results.items():
+            for event in events:
+                event["calendar_id"] = calendar_id
+            self._annotate_events(events, calendars)
+            self._apply_sync(
+                calendar_id,
+                states.get(calendar_id),
+                full_sync,
+                events,
+                next_sync_token,
+                sync_start,
+                sync_end,
             )
 
-            # Cache events in local database
-            self._cache_events(all_events)
+    def _apply_sync(
+        self, calendar_id, state, full_sync, events, next_sync_token, start, end
+    ):
+        """Apply the result of a full or incremental sync to CalendarEvent."""
+        try:
+            # A full sync replaces everything stored for the calendar; an
+            # incremental one only touches the events it returned
+            self._reconcile_events(calendar_id, events, full=full_sync)
+
+            if not state:
+                state = CalendarSyncState(calendar_id=calendar_id)
+                db.session.add(state)
+
+            now = datetime.utcnow()
+            state.sync_token = next_sync_token
+            state.last_synced = now
+            if full_sync:
+                state.window_start = start
+                state.window_end = end
+                state.last_full_sync = now
 
-            return all_events
+            db.session.commit()
 
         except Exception as e:
-            print(f"Error fetching calendar events: {e}")
-            return self._get_cached_events(start_date, end_date)
+            print(f"Error applying sync for calendar {calendar_id}: {e}")
+            db.session.rollback()
+
+    def _list_all_events(self, calendar_id, **params):
+        """List every page of events for a calendar.
+
+        Returns the events and the nextSyncToken from the final page.
+        """
+        events = []
+        page_token = None
+        while True:
+            result = upstream.execute(
+                "google_calendar",
+                self.service.events().list(
+                    calendarId=calendar_id,
+                    singleEvents=True,
+                    maxResults=2500,
+                    pageToken=page_token,
+                    **params,
+                ),
+            )
+            events.extend(result.get("items", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return events, result.get("nextSyncToken")
+
+    def _get_sync_window(self):
+        """Get the range kept in sync: a few weeks back and ahead of this week."""
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        start_of_week = today - timedelta(days=today.weekday())
+        return (
+            start_of_week - timedelta(weeks=Config.CALENDAR_SYNC_WEEKS_BACK),
+            start_of_week + timedelta(weeks=Config.CALENDAR_SYNC_WEEKS_AHEAD + 1),
+        )
+
+    def _get_synced_events(self, calendar_ids, start_date, end_date):
+        """Get synced events overlapping a window from the local database."""
+        events = (
+            CalendarEvent.query.filter(
+                CalendarEvent.calendar_id.in_(calendar_ids),
+                CalendarEvent.overlapping(start_date, end_date),
+            )
+            .order_by(CalendarEvent.start_time)
+            .all()
+        )
+        return [self._event_from_row(event) for event in events]
+
+    def _fetch_window(
+        self, calendar_ids, start_date, end_date, calendars=None, windows=None
+    ):
+        """Fetch a window outside the sync range directly from Google.
+
+        The fetch is recorded for each of `windows` (default: the fetched
+        window itself).
+        """
+        # Format dates for Google Calendar API
+        start_str = start_date.isoformat() + "Z"
+        end_str = end_date.isoformat() + "Z"
+
+        # Fetch events from all calendars concurrently
+        calendar_events = self._fetch_concurrently(
+            calendar_ids,
+            lambda calendar_id: self._fetch_calendar_events(
+                calendar_id, start_str, end_str
+            ),
+        )
+
+        all_events = []
+        for calendar_id in calendar_ids:
+            events = calendar_events.get(calendar_id, [])
+            for event in events:
+                event["calendar_id"] = calendar_id
+            all_events.extend(events)
+        self._annotate_events(all_events, calendars)
+
+        # Cache events in local database
+        self._cache_events(all_events, start_date, end_date, list(calendar_events))
+
+        if calendar_events:
+            for window_start, window_end in windows or [(start_date, end_date)]:
+                self._record_window_fetch(
+                    window_start, window_end, calendar_ids, list(calendar_events)
+                )
 
-    def _cache_events(self, events):
-        """Cache events in local database."""
+        return all_events
+
+    def _record_window_fetch(self, start_date, end_date, calendar_ids, fetched_ids):
+        """Remember when each calendar's events in a window were fetched.
+
+        A calendar whose fetch failed keeps its previous time, or stays
+        unrecorded if it never succeeded, so the window is not fetched
+        again on every request because of it. Calendars no longer shown
+        are dropped.
+        """
+        cache = get_cache()
+        key = _window_key(start_date, end_date)
+        previous = cache.get(WINDOW_FETCHES, key, allow_stale=True) or {}
+        now = datetime.utcnow().isoformat()
+        cache.set(
+            WINDOW_FETCHES,
+            key,
+            {
+                calendar_id: now
+                if calendar_id in fetched_ids
+                else previous[calendar_id]
+                for calendar_id in calendar_ids
+                if calendar_id in fetched_ids or calendar_id in previous
+            },
+        )
+
+    def _annotate_events(self, events, calendars=None):
+        """Add calendar name and color to each event."""
+        if calendars is None:
+            calendars = get_cache().get("calendar_list", "all", allow_stale=True)
+        calendars_by_id = {cal["id"]: cal for cal in calendars or []}
+
+        for event in events:
+            calendar_id = event.get("calendar_id", "primary")
+            calendar = calendars_by_id.get(calendar_id)
+            if calendar_id != "primary" and calendar:
+                event["calendar_name"] = calendar["summary"]
+                event["calendar_color"] = calendar["color"]
+            elif calendar_id == "primary" or "calendar_name" not in event:
+                event["calendar_name"] = "Primary"
+                event["calendar_color"] = "1"  # Default blue
+
+    def _event_from_row(self, row):
+        """Build a Google Calendar style event dict from a cached row."""
+        event = row.get_payload()
+        if not event:
+            event = {
+                "id": row.id,
+                "summary": row.title,
+                "description": row.description,
+                "start": {"dateTime": row.start_time.isoformat() + "Z"},
+                "end": {"dateTime": row.end_time.isoformat() + "Z"},
+            }
+        event["calendar_id"] = row.calendar_id
+        return event
+
+    def _fetch_calendar_events(self, calendar_id, start_str, end_str):
+        """Fetch the events of a single calendar within a time window.
+
+        Every page is read: cached events the result leaves out are deleted.
+        """
+        events, _ = self._list_all_events(
+            calendar_id, timeMin=start_str, timeMax=end_str, orderBy="startTime"
+        )
+        return events
+
+    def _fetch_concurrently(self, calendar_ids, fetch):
+        """Run fetch(calendar_id) for each calendar on the shared worker pool.
+
+        Returns a dict of calendar_id -> result. A failing calendar is logged
+        and left out so it cannot affect the others.
+        """
+        results = {}
+        if not calendar_ids:
+            return results
+
+        futures = {
+            _fetch_executor.submit(fetch, calendar_id): calendar_id
+            for calendar_id in calendar_ids
+        }
+        for future in as_completed(futures):
+            calendar_id = futures[future]
+            try:
+                results[calendar_id] = future.result()
+            except Exception as e:
+                print(f"Error fetching events from calendar {calendar_id}: {e}")
+
+        return results
+
+    def _cache_events(self, events, start_date, end_date, calendar_ids):
+        """Cache the events fetched for a window in local database.
+
+        calendar_ids are the calendars whose fetch succeeded; each of them is
+        reconciled, so one with no events left in the window loses its
+        cached events there.
+        """
         try:
+            events_by_calendar = {calendar_id: [] for calendar_id in calendar_ids}
             for event in events:
-                event_id = event.get("id")
-                if not event_id:
-                    continue
-
-                # Check if event already exists
-                existing_event = CalendarEvent.query.get(event_id)
-
-                # Parse start and end times
-                start_time = self._parse_datetime(event.get("start", {}))
-                end_time = self._parse_datetime(event.get("end", {}))
-
-                if not start_time or not end_time:
-                    continue
-
-                event_data = {
-                    "id": event_id,
-                    "title": event.get("summary", "No Title"),
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "category": self._get_category(event),
-                    "description": event.get("description", ""),
-                    "recurring": "recurrence" in event,
-                    "last_updated": datetime.utcnow(),
-                }
-
-                if existing_event:
-                    # Update existing event
-                    for key, value in event_data.items():
-                        setattr(existing_event, key, value)
-                else:
-                    # Create new event
-                    new_event = CalendarEvent(**event_data)
-                    db.session.add(new_event)
+                calendar_id = event.get("calendar_id", "primary")
+                events_by_calendar.setdefault(calendar_id, []).append(event)
+
+            for calendar_id, calendar_events in events_by_calendar.items():
+                self._reconcile_events(
+                    calendar_id, calendar_events, window=(start_date, end_date)
+                )
 
             db.session.commit()
 
@@ -220,15 +602,120 @@ class GoogleCalendarService:
             print(f"Error caching events: {e}")
             db.session.rollback()
 
+    def _reconcile_events(self, calendar_id, events, window=None, full=False):
+        """Upsert a calendar's events with one query, writing only what changed.
+
+        Existing rows are loaded in a single query and compared by Google etag
+        (or a content hash), so unchanged events are never rewritten. With
+        full=True every stored event of the calendar that was not fetched is
+        deleted; with a window, only stored events overlapping that window are.
+        Cancelled events are always deleted. The caller commits.
+        """
+        fetched = {}
+        cancelled_ids = set()
+        for event in events:
+            event_id = event.get("id")
+            if not event_id:
+                continue
+            if event.get("status") == "cancelled":
+                cancelled_ids.add(event_id)
+            else:
+                fetched[event_id] = event
+
+        query = CalendarEvent.query.filter(CalendarEvent.calendar_id == calendar_id)
+        requested_ids = CalendarEvent.id.in_(set(fetched) | cancelled_ids)
+        if window:
+            start_date, end_date = window
+            query = query.filter(
+                or_(CalendarEvent.overlapping(start_date, end_date), requested_ids)
+            )
+        elif not full:
+            query = query.filter(requested_ids)
+        existing = {row.id: row for row in query.all()}
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+        now = datetime.utcnow()
+
+        for event_id, event in fetched.items():
+            payload = dict(event, calendar_id=calendar_id)
+            etag = event.get("etag") or self._content_hash(payload)
+
+            row = existing.get(event_id)
+            if row and row.etag == etag:
+                counts["unchanged"] += 1
+                continue
+
+            # Parse start and end times
+            start_time = self._to_utc(self._parse_datetime(event.get("start", {})))
+            end_time = self._to_utc(self._parse_datetime(event.get("end", {})))
+            if not start_time or not end_time:
+                continue
+
+            if row:
+                counts["updated"] += 1
+            else:
+                row = CalendarEvent(id=event_id, calendar_id=calendar_id)
+                db.session.add(row)
+                counts["inserted"] += 1
+
+            row.title = event.get("summary", "No Title")
+            row.start_time = start_time
+            row.end_time = end_time
+            row.category = self._get_category(event)
+            row.description = event.get("description", "")
+            row.recurring = "recurrence" in event or "recurringEventId" in event
+            row.etag = etag
+            row.set_payload(payload)
+            row.last_updated = now
+
+        # Remove events that were cancelled or have disappeared upstream
+        if full:
+            stale_ids = set(existing) - set(fetched)
+        elif window:
+            stale_ids = {
+                row.id
+                for row in existing.values()
+                if row.id not in fetched
+                and row.start_time < end_date
+                and row.end_time > start_date
+            }
+        else:
+            stale_ids = set()
+        stale_ids |= cancelled_ids & set(existing)
+        if stale_ids:
+            counts["deleted"] = CalendarEvent.query.filter(
+                CalendarEvent.calendar_id == calendar_id,
+                CalendarEvent.id.in_(stale_ids),
+            ).delete(synchronize_session=False)
+
+        return counts
+
+    def _content_hash(self, event):
+        """Hash an event's content for change detection when it has no etag."""
+        return hashlib.sha1(
+            json.dumps(event, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
     def _get_cached_events(self, start_date, end_date):
         """Get cached events from local database."""
         try:
-            events = CalendarEvent.query.filter(
-                CalendarEvent.start_time >= start_date,
-                CalendarEvent.start_time <= end_date,
-            ).all()
+            # Never call the calendarList API from the cache path
+            calendars = get_cache().get("calendar_list", "all", allow_stale=True)
 
-            return [event.to_dict() for event in events]
+            # Include events that started before the window but are still running
+            query = CalendarEvent.query.filter(
+                CalendarEvent.overlapping(start_date, end_date)
+            )
+            if calendars:
+                selected_ids = {cal["id"] for cal in calendars if cal["selected"]}
+                selected_ids.add("primary")
+                query = query.filter(CalendarEvent.calendar_id.in_(selected_ids))
+            events = query.order_by(CalendarEvent.start_time).all()
+
+            cached_events = [self._event_from_row(event) for event in events]
+            self._annotate_events(cached_events, calendars or [])
+            cached_events.sort(key=self._event_sort_key)
+            return cached_events
 
         except Exception as e:
             print(f"Error getting cached events: {e}")
@@ -247,6 +734,21 @@ class GoogleCalendarService:
         except Exception:
             return None
 
+    def _to_utc(self, value):
+        """Convert an aware datetime to naive UTC for storage; dates are kept as-is."""
+        if value and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def _event_sort_key(self, event):
+        """Sort key placing events from calendars in different time zones in order."""
+        start_time = self._parse_datetime(event.get("start", {}))
+        if not start_time:
+            return 0
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        return start_time.timestamp()
+
     def _get_category(self, event):
         """Determine event category based on event data."""
         # Simple categorization - can be enhanced
@@ -0,0 +1,92 @@
+import threading
+import httplib2
+import google_auth_httplib2
+from googleapiclient.discovery import build
+from .auth import get_credential_store
+
+HTTP_TIMEOUT = 30  # seconds
+
+
+class ThreadLocalAuthorizedHttp:
+    """Authorized HTTP transport that keeps one keep-alive connection pool per thread.
+
+    httplib2.Http is not thread-safe, so every thread gets its own
+    AuthorizedHttp, all bound to the same shared credentials object.
+    """
+
+    def __init__(self, credentials, timeout=HTTP_TIMEOUT):
+        self.credentials = credentials
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _http(self):
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials, http=httplib2.Http(timeout=self.timeout)
+            )
+            self._local.http = http
+        return http
+
+    def request(self, *args, **kwargs):
+        return self._http().request(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._http(), name)
+
+
+class GoogleClientRegistry:
+    """Builds each Google API client once and reuses it across requests.
+
+    Clients are built from the discovery documents bundled with
+    google-api-python-client and share one pooled, authorized transport.
+    They are only rebuilt when the credential store loads new credentials.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._http = None
+        self._generation = None
+
+    def get(self, api, version):
+        """Return a memoized client for the given API, or None if not authenticated."""
+        store = get_credential_store()
+        creds = store.get()
+        if not creds:
+            return None
+
+        with self._lock:
+            if store.generation != self._generation:
+                # Credentials changed (login, logout or token.json replaced)
+                self._clients.clear()
+                self._http = ThreadLocalAuthorizedHttp(creds)
+                self._generation = store.generation
+
+            client = self._clients.get((api, version))
+            if client is None:
+                client = build(
+                    api,
+                    version,
+                    http=self._http,
+                    static_discovery=True,
+                    cache_discovery=False,
+                )
+                self._clients[(api, version)] = client
+
+            return client
+
+    def clear(self):
+        """Drop all cached clients so the next call rebuilds them."""
+        with self._lock:
+            self._clients.clear()
+            self._http = None
+            self._generation = None
+
+
+_registry = GoogleClientRegistry()
+
+
+def get_google_client(api, version):
+    """Return the shared client for a Google API."""
+    return _registry.get(api, version)
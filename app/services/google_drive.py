@@ -1,8 +1,26 @@
+import json
 import os
-from googleapiclient.discovery import build
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from googleapiclient.http import MediaIoBaseDownload
 from .auth import GoogleAuthService
+from .cache import get_cache
+from .google_clients import get_google_client
+from .icon_variants import CHORE_ICONS_DIR, file_md5, generate_variants
+from . import upstream
 from config import Config
 
+PARTIAL_SUFFIX = ".part"
+MANIFEST_NAME = ".manifest.json"
+
+# Shared by every sync so its threads, and the HTTP connection each keeps
+# open, are reused
+_download_executor = ThreadPoolExecutor(
+    max_workers=max(1, Config.ICON_DOWNLOAD_WORKERS),
+    thread_name_prefix="icon-download",
+)
+
 
 class GoogleDriveService:
     def __init__(self):
@@ -14,8 +32,7 @@ class GoogleDriveService:
     def _initialize_service(self):
         """Initialize the Google Drive service."""
         try:
-            creds = self.auth_service.get_credentials()
-            self.service = build("drive", "v3", credentials=creds)
+            self.service = get_google_client("drive", "v3")
             # Get the icons folder ID from config
             self.icons_folder_id = Config.GOOGLE_DRIVE_ICONS_FOLDER_ID
         except Exception as e:
@@ -23,9 +40,12 @@ class GoogleDriveService:
             self.service = None
 
     def list_icons(self):
-        """List all icon files in the Google Drive icons folder."""
+        """List all icon files in the Google Drive icons folder.
+
+        Returns None if the folder could not be listed.
+        """
         if not self.service or not self.icons_folder_id:
-            return []
+            return None
 
         try:
             # Query for files in the icons folder
@@ -33,17 +53,27 @@ class GoogleDriveService:
                 f"'{self.icons_folder_id}' in parents and mimeType contains 'image/'"
             )
 
-            results = (
-                self.service.files()
-                .list(
-                    q=query,
-                    fields="files(id,name,mimeType,webContentLink)",
-                    orderBy="name",
+            files = []
+            page_token = None
+            while True:
+                results = upstream.execute(
+                    "google_drive",
+                    self.service.files().list(
+                        q=query,
+                        fields=(
+                            "nextPageToken,"
+                            "files(id,name,mimeType,webContentLink,"
+                            "md5Checksum,modifiedTime)"
+                        ),
+                        orderBy="name",
+                        pageSize=1000,
+                        pageToken=page_token,
+                    ),
                 )
-                .execute()
-            )
-
-            files = results.get("files", [])
+                files.extend(results.get("files", []))
+                page_token = results.get("nextPageToken")
+                if not page_token:
+                    break
 
             # Process files to create a mapping of name to file info
             return {
@@ -52,75 +82,247 @@ class GoogleDriveService:
                     "name": file["name"],
                     "url": file["webContentLink"],
                     "mime_type": file["mimeType"],
+                    "md5": file.get("md5Checksum"),
+                    "modified_time": file.get("modifiedTime"),
                 }
                 for file in files
             }
 
         except Exception as e:
             print(f"Error listing icons: {e}")
-            return {}
+            return None
+
+    def get_file_version(self, file_id):
+        """Get a file's Drive version (bumped on every edit), or None on error."""
+        if not self.service or not file_id:
+            return None
+
+        try:
+            metadata = upstream.execute(
+                "google_drive",
+                self.service.files().get(fileId=file_id, fields="version,modifiedTime"),
+            )
+            return f"{metadata.get('version')}:{metadata.get('modifiedTime')}"
+
+        except Exception as e:
+            print(f"Error getting version of file {file_id}: {e}")
+            return None
 
     def download_icon(self, file_id, save_path):
-        """Download an icon file to local storage."""
+        """Stream an icon file to local storage.
+
+        The file is written in chunks to a temp file next to save_path and
+        renamed into place, so an interrupted download never leaves a
+        truncated icon behind.
+        """
         if not self.service or not file_id:
             return False
 
+        directory = os.path.dirname(save_path) or "."
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory,
+            prefix=f".{os.path.basename(save_path)}.",
+            suffix=PARTIAL_SUFFIX,
+        )
         try:
-            # Get file content
-            request = self.service.files().get_media(fileId=file_id)
-
-            # Download the file
-            with open(save_path, "wb") as f:
-                f.write(request.execute())
+            with os.fdopen(fd, "wb") as f:
+                request = self.service.files().get_media(fileId=file_id)
+                downloader = MediaIoBaseDownload(
+                    f, request, chunksize=Config.ICON_DOWNLOAD_CHUNK_SIZE
+                )
+                done = False
+                while not done:
+                    _, done = upstream.call("google_drive", downloader.next_chunk)
+                f.flush()
+                os.fsync(f.fileno())
 
+            os.replace(temp_path, save_path)
             return True
 
         except Exception as e:
             print(f"Error downloading icon {file_id}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
             return False
 
-    def sync_icons_to_local(self, local_icons_dir):
-        """Download icons from Google Drive folder to local directory, skipping existing files."""
+    def sync_icons_to_local(self, local_icons_dir, force=False):
+        """Bring a local directory in line with the Google Drive icons folder.
+
+        A manifest in the directory records the Drive id, md5Checksum and
+        modifiedTime of every downloaded icon, so only new or changed files
+        are downloaded and icons removed from Drive are deleted. The folder
+        listing itself is skipped while the folder's version is unchanged.
+        Returns a report of the sync, or False if it failed.
+        """
         if not self.service or not self.icons_folder_id:
             return False
 
         try:
             # Create local icons directory if it doesn't exist
             os.makedirs(local_icons_dir, exist_ok=True)
+            _remove_partial_downloads(local_icons_dir)
 
-            # Get all icons from the folder
-            icons = self.list_icons()
+            manifest = _load_manifest(local_icons_dir)
+            folder_version = self.get_file_version(self.icons_folder_id)
+            if not force and _manifest_is_current(
+                manifest, folder_version, local_icons_dir
+            ):
+                return {"skipped": True}
 
-            if not icons:
-                print("No icons found in Google Drive folder")
+            icons = self.list_icons()
+            if icons is None:
                 return False
 
-            downloaded_count = 0
-            skipped_count = 0
+            files = {}
+            downloads = {}
             for icon_info in icons.values():
-                file_id = icon_info["id"]
-                original_name = icon_info["name"]
-                local_path = os.path.join(local_icons_dir, original_name)
-
-                # Skip if file already exists
-                if os.path.exists(local_path):
-                    skipped_count += 1
-                    continue
-
-                if self.download_icon(file_id, local_path):
-                    downloaded_count += 1
-                    print(f"Downloaded: {original_name}")
+                name = icon_info["name"]
+                entry = {
+                    "id": icon_info["id"],
+                    "md5": icon_info["md5"],
+                    "modified_time": icon_info["modified_time"],
+                }
+                local_path = os.path.join(local_icons_dir, name)
+                if _is_unchanged(manifest["files"].get(name), entry, local_path):
+                    files[name] = entry
                 else:
-                    print(f"Failed to download: {original_name}")
+                    downloads[name] = (entry, local_path)
 
-            if downloaded_count > 0:
-                print(
-                    f"Successfully downloaded {downloaded_count} icons to {local_icons_dir}"
-                )
-            if skipped_count > 0:
-                print(f"Skipped {skipped_count} existing icons")
-            return True
+            results = self._download_concurrently(
+                {name: (entry["id"], path) for name, (entry, path) in downloads.items()}
+            )
+            failed = []
+            for name, ok in results.items():
+                if ok:
+                    files[name] = downloads[name][0]
+                    print(f"Downloaded: {name}")
+                else:
+                    failed.append(name)
+                    print(f"Failed to download: {name}")
+
+            listed = {icon_info["name"] for icon_info in icons.values()}
+            removed = [name for name in manifest["files"] if name not in listed]
+            for name in removed:
+                try:
+                    os.remove(os.path.join(local_icons_dir, name))
+                    print(f"Removed: {name}")
+                except FileNotFoundError:
+                    pass
+
+            _save_manifest(
+                local_icons_dir,
+                {
+                    # Failed downloads must be retried even if the folder is unchanged
+                    "folder_version": None if failed else folder_version,
+                    "listed_at": time.time(),
+                    "files": files,
+                },
+            )
+
+            report = {
+                "skipped": False,
+                "downloaded": len(results) - len(failed),
+                "unchanged": len(icons) - len(downloads),
+                "removed": len(removed),
+                "failed": len(failed),
+            }
+            print(
+                f"Icon sync: downloaded {report['downloaded']}, "
+                f"unchanged {report['unchanged']}, removed {report['removed']}, "
+                f"failed {report['failed']}"
+            )
+            return report
 
         except Exception as e:
             print(f"Error syncing icons: {e}")
             return False
+
+    def _download_concurrently(self, downloads):
+        """Run download_icon for each name -> (file_id, path) on the shared pool.
+
+        Returns a dict of name -> success.
+        """
+        results = {}
+        if not downloads:
+            return results
+
+        futures = {
+            _download_executor.submit(self.download_icon, file_id, path): name
+            for name, (file_id, path) in downloads.items()
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+        return results
+
+
+def _remove_partial_downloads(directory):
+    """Delete temp files left behind by downloads interrupted mid-write."""
+    for name in os.listdir(directory):
+        if name.endswith(PARTIAL_SUFFIX):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError as e:
+                print(f"Error removing partial download {name}: {e}")
+
+
+def _load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        if isinstance(manifest.get("files"), dict):
+            return manifest
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"Ignoring unreadable icon manifest: {e}")
+    return {"folder_version": None, "listed_at": 0, "files": {}}
+
+
+def _save_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST_NAME)
+    temp_path = path + PARTIAL_SUFFIX
+    with open(temp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def _manifest_is_current(manifest, folder_version, directory):
+    """Check whether the last listing can be trusted without listing again.
+
+    Editing a file in place does not always change its folder's
+    modifiedTime, so a full listing still runs every ICON_FULL_SYNC_INTERVAL.
+    """
+    return bool(
+        folder_version
+        and manifest.get("folder_version") == folder_version
+        and time.time() - manifest.get("listed_at", 0) < Config.ICON_FULL_SYNC_INTERVAL
+        and all(
+            os.path.exists(os.path.join(directory, name)) for name in manifest["files"]
+        )
+    )
+
+
+def _is_unchanged(previous, entry, path):
+    if not os.path.exists(path):
+        return False
+    if previous is not None:
+        return previous == entry
+    # Not downloaded by a sync yet (e.g. bundled with the app): keep it if identical
+    return entry["md5"] is not None and file_md5(path) == entry["md5"]
+
+
+def sync_chore_icons(force=False):
+    """Sync the chore icons in app/static/icons/chores from Google Drive.
+
+    Display-sized variants are then brought up to date, and cached chores
+    are invalidated when their variant URLs changed.
+    """
+    report = GoogleDriveService().sync_icons_to_local(CHORE_ICONS_DIR, force=force)
+
+    variants = generate_variants(CHORE_ICONS_DIR)
+    if variants and (variants["generated"] or variants["removed"]):
+        get_cache().invalidate("chores")
+
+    return report
@@ -1,12 +1,40 @@
-from googleapiclient.discovery import build
 from .auth import GoogleAuthService
+from .google_clients import get_google_client
+from . import upstream
+from .cache import get_cache
 from .google_drive import GoogleDriveService
 from app.models.chores import Chore
+from app.models.sheets import SheetMutation
 from app.models.todos import Todo
 from app import db
 from datetime import datetime
 from config import Config
-import os
+import hashlib
+import json
+import re
+import threading
+
+# Day abbreviations accepted in the Chores sheet's Day column
+DAY_ABBREVIATIONS = {
+    "su": "Sunday",
+    "sun": "Sunday",
+    "m": "Monday",
+    "mon": "Monday",
+    "tu": "Tuesday",
+    "tue": "Tuesday",
+    "tues": "Tuesday",
+    "w": "Wednesday",
+    "wed": "Wednesday",
+    "th": "Thursday",
+    "thu": "Thursday",
+    "thur": "Thursday",
+    "f": "Friday",
+    "fri": "Friday",
+    "sa": "Saturday",
+    "sat": "Saturday",
+}
+
+_flush_lock = threading.Lock()
 
 
 class GoogleSheetsService:
@@ -15,13 +43,13 @@ class GoogleSheetsService:
         self.service = None
         self.chores_sheet_id = None
         self.todos_sheet_id = None
+        self.last_sync_report = None
         self._initialize_service()
 
     def _initialize_service(self):
         """Initialize the Google Sheets service."""
         try:
-            creds = self.auth_service.get_credentials()
-            self.service = build("sheets", "v4", credentials=creds)
+            self.service = get_google_client("sheets", "v4")
             # Use the same spreadsheet ID for both chores and todos
             self.chores_sheet_id = Config.GOOGLE_SHEETS_ID
             self.todos_sheet_id = Config.GOOGLE_SHEETS_ID
@@ -29,203 +57,510 @@ class GoogleSheetsService:
             print(f"Error initializing Google Sheets service: {e}")
             self.service = None
 
-    def sync_chores_from_sheets(self):
-        """Sync chores from Google Sheets to local database."""
+    def get_chores(self):
+        """Get all chores as dicts, cached in memory until they change."""
+        cache = get_cache()
+        chores = cache.get("chores", "all")
+        if chores is None:
+            chores = [chore.to_dict() for chore in Chore.query.all()]
+            cache.set("chores", "all", chores)
+        return chores
+
+    def get_todos(self):
+        """Get all todos as dicts sorted by priority, cached until they change."""
+        cache = get_cache()
+        todos = cache.get("todos", "all")
+        if todos is None:
+            todos = [
+                todo.to_dict()
+                for todo in Todo.query.order_by(
+                    Todo.priority.desc(), Todo.created_date.asc()
+                ).all()
+            ]
+            cache.set("todos", "all", todos)
+        return todos
+
+    def sync_chores_from_sheets(self, force=False):
+        """Sync chores from Google Sheets to local database.
+
+        Skipped when the spreadsheet has not changed since the last sync
+        (unless forced); otherwise only rows that were added, edited or
+        removed in the sheet are written. A summary is left in
+        self.last_sync_report.
+        """
         if not self.service or not self.chores_sheet_id:
             return []
 
         try:
-            # Read chores from Google Sheets
-            range_name = f"{Config.CHORES_SHEET_NAME}!A:F"  # Name, Assigned To, Frequency, Day, Icon Name
-            result = (
-                self.service.spreadsheets()
-                .values()
-                .get(spreadsheetId=self.chores_sheet_id, range=range_name)
-                .execute()
-            )
-
-            values = result.get("values", [])
-            if not values:
-                return []
-
-            # Skip header row
-            chores_data = values[1:] if len(values) > 1 else []
-
-            # Store existing completion status before clearing
-            existing_chores = Chore.query.all()
-            completion_status = {}
-            for chore in existing_chores:
-                completion_status[chore.name] = {
-                    "completed": chore.completed,
-                    "completed_date": chore.completed_date,
-                }
-
-            # Clear existing chores
-            Chore.query.delete()
-
-            # Add new chores
-            for i, row in enumerate(chores_data):
-                # Require at least 3 columns: Name, Assigned To, Frequency
-                # Day and Icon are optional (daily chores may not have a day)
-                if len(row) >= 3:
-                    chore_name = row[0] if row[0] else None
-                    assigned_to = row[1] if len(row) > 1 and row[1] else None
-
-                    # Skip rows with missing essential data
-                    if not chore_name or not assigned_to:
-                        print(f"Skipping row {i+2}: missing name or assigned_to")
-                        continue
-
-                    # Normalize frequency to lowercase and trim whitespace
-                    frequency = (
-                        row[2].strip().lower() if len(row) > 2 and row[2] else None
-                    )
-
-                    if not frequency:
-                        print(f"Skipping row {i+2}: missing frequency")
-                        continue
-
-                    # Normalize day_of_week - convert to full day name if needed
-                    # Daily chores may not have a day_of_week column
-                    day_of_week = None
-                    if len(row) > 3 and row[3]:
-                        day_str = row[3].strip()
-                        if day_str:  # Only process if day is not empty
-                            # Map common abbreviations to full day names
-                            day_map = {
-                                "su": "Sunday",
-                                "sun": "Sunday",
-                                "m": "Monday",
-                                "mon": "Monday",
-                                "tu": "Tuesday",
-                                "tue": "Tuesday",
-                                "tues": "Tuesday",
-                                "w": "Wednesday",
-                                "wed": "Wednesday",
-                                "th": "Thursday",
-                                "thu": "Thursday",
-                                "thur": "Thursday",
-                                "f": "Friday",
-                                "fri": "Friday",
-                                "sa": "Saturday",
-                                "sat": "Saturday",
-                            }
-                            day_lower = day_str.lower()
-                            day_of_week = day_map.get(
-                                day_lower, day_str
-                            )  # Use mapping or original if not found
-
-                    chore = Chore(
-                        name=chore_name,
-                        assigned_to=assigned_to,
-                        frequency=frequency,
-                        day_of_week=day_of_week,
-                        icon_name=row[4] if len(row) > 4 and row[4] else None,
-                        google_sheet_row=i
-                        + 2,  # +2 because of header and 0-based indexing
-                    )
-
-                    # Restore completion status if chore existed before
-                    if chore_name in completion_status:
-                        chore.completed = completion_status[chore_name]["completed"]
-                        chore.completed_date = completion_status[chore_name][
-                            "completed_date"
-                        ]
-
-                    db.session.add(chore)
-
-            db.session.commit()
-
-            # Download icons from Google Drive after syncing chores
-            self._sync_icons_from_drive()
-
+            self.last_sync_report = self._sync_tabs(["chores"], force)["chores"]
             return Chore.query.all()
 
         except Exception as e:
             print(f"Error syncing chores from sheets: {e}")
             db.session.rollback()
+            self.last_sync_report = {"skipped": True, "reason": str(e)}
             return Chore.query.all()
 
-    def sync_todos_from_sheets(self):
-        """Sync todos from Google Sheets to local database."""
+    def sync_todos_from_sheets(self, force=False):
+        """Sync todos from Google Sheets to local database.
+
+        Skipped when the spreadsheet has not changed since the last sync
+        (unless forced); otherwise only rows that were added, edited or
+        removed in the sheet are written. A summary is left in
+        self.last_sync_report.
+        """
         if not self.service or not self.todos_sheet_id:
             return []
 
         try:
-            # Read todos from Google Sheets
-            range_name = f"{Config.TODOS_SHEET_NAME}!A:E"  # Title, Priority, Assigned To, Due Date
-            result = (
+            self.last_sync_report = self._sync_tabs(["todos"], force)["todos"]
+            return Todo.query.all()
+
+        except Exception as e:
+            print(f"Error syncing todos from sheets: {e}")
+            db.session.rollback()
+            self.last_sync_report = {"skipped": True, "reason": str(e)}
+            return Todo.query.all()
+
+    def sync_all_from_sheets(self, force=False):
+        """Sync chores and todos together.
+
+        Both tabs are read with a single batchGet and applied in one
+        transaction. self.last_sync_report holds a report per tab.
+        Returns (chores, todos).
+        """
+        if not self.service or not Config.GOOGLE_SHEETS_ID:
+            return [], []
+
+        try:
+            self.last_sync_report = self._sync_tabs(["chores", "todos"], force)
+        except Exception as e:
+            print(f"Error syncing chores and todos from sheets: {e}")
+            db.session.rollback()
+            report = {"skipped": True, "reason": str(e)}
+            self.last_sync_report = {"chores": report, "todos": report}
+
+        return Chore.query.all(), Todo.query.all()
+
+    def _sync_tabs(self, names, force=False):
+        """Sync sheet tabs ("chores", "todos") into their tables.
+
+        Each spreadsheet's Drive version is checked first, so an unedited
+        sheet costs one metadata call. The remaining ranges are downloaded
+        with one values().batchGet per spreadsheet and compared by hash
+        before any rows are reconciled, and all tables are written in one
+        transaction. Returns a report per tab whose "skipped" says whether
+        anything was applied.
+        """
+        cache = get_cache()
+        tabs = self._tabs()
+
+        # Local edits go out first so the download can't undo them
+        self.flush_mutations()
+        queued = {
+            tab
+            for (tab,) in SheetMutation.pending()
+            .with_entities(SheetMutation.tab)
+            .distinct()
+        }
+
+        drive_service = GoogleDriveService()
+        versions = {}
+        states = {}
+        reports = {}
+        pending = {}  # sheet_id -> names of tabs to download
+        for name in names:
+            if name in queued:
+                reports[name] = {"skipped": True, "reason": "local changes pending"}
+                continue
+
+            _, sheet_id, range_name, _ = tabs[name]
+            if sheet_id not in versions:
+                versions[sheet_id] = drive_service.get_file_version(sheet_id)
+            states[name] = (
+                cache.get("sheets_sync", f"{sheet_id}:{range_name}", allow_stale=True)
+                or {}
+            )
+
+            version = versions[sheet_id]
+            if not force and version and states[name].get("version") == version:
+                reports[name] = {"skipped": True, "reason": "spreadsheet unchanged"}
+            else:
+                pending.setdefault(sheet_id, []).append(name)
+
+        values_by_tab = {}
+        for sheet_id, pending_names in pending.items():
+            result = upstream.execute(
+                "google_sheets",
                 self.service.spreadsheets()
                 .values()
-                .get(spreadsheetId=self.todos_sheet_id, range=range_name)
-                .execute()
+                .batchGet(
+                    spreadsheetId=sheet_id,
+                    ranges=[tabs[name][2] for name in pending_names],
+                ),
             )
+            # Value ranges come back in the order they were requested
+            for name, value_range in zip(pending_names, result.get("valueRanges", [])):
+                values_by_tab[name] = value_range.get("values", [])
 
-            values = result.get("values", [])
+        hashes = {}
+        for name, values in values_by_tab.items():
+            model, _, _, parse_row = tabs[name]
             if not values:
-                return []
+                reports[name] = {"skipped": True, "reason": "sheet is empty"}
+                continue
+
+            hashes[name] = hashlib.sha1(json.dumps(values).encode("utf-8")).hexdigest()
+            if not force and states[name].get("values_hash") == hashes[name]:
+                reports[name] = {"skipped": True, "reason": "values unchanged"}
+                continue
 
             # Skip header row
-            todos_data = values[1:] if len(values) > 1 else []
-
-            # Store existing completion status before clearing
-            existing_todos = Todo.query.all()
-            completion_status = {}
-            for todo in existing_todos:
-                completion_status[todo.title] = {
-                    "completed": todo.completed,
-                    "completed_date": todo.completed_date,
-                }
+            rows = [
+                parse_row(i + 2, row)  # +2 for header and 0-based index
+                for i, row in enumerate(values[1:])
+            ]
+            reports[name] = self._reconcile_rows(model, [row for row in rows if row])
+            reports[name]["skipped"] = False
+
+        db.session.commit()
+
+        for name, values_hash in hashes.items():
+            if self._has_changes(reports[name]):
+                cache.invalidate(name)
+            _, sheet_id, range_name, _ = tabs[name]
+            cache.set(
+                "sheets_sync",
+                f"{sheet_id}:{range_name}",
+                {"version": versions[sheet_id], "values_hash": values_hash},
+            )
 
-            # Clear existing todos
-            Todo.query.delete()
-
-            # Add new todos
-            for i, row in enumerate(todos_data):
-                if len(row) >= 2:  # Ensure we have enough columns (title and priority)
-                    due_date = None
-                    if len(row) > 3 and row[3]:
-                        try:
-                            due_date = datetime.strptime(row[3], "%Y-%m-%d").date()
-                        except ValueError:
-                            pass
-
-                    todo_title = row[0]
-                    todo = Todo(
-                        title=todo_title,
-                        priority=(
-                            int(row[1]) if len(row) > 1 and row[1].isdigit() else 5
-                        ),
-                        assigned_to=row[2] if len(row) > 2 else None,
-                        due_date=due_date,
-                        google_sheet_row=i
-                        + 2,  # +2 because of header and 0-based indexing
-                    )
-
-                    # Restore completion status if todo existed before
-                    if todo_title in completion_status:
-                        todo.completed = completion_status[todo_title]["completed"]
-                        todo.completed_date = completion_status[todo_title][
-                            "completed_date"
-                        ]
-
-                    db.session.add(todo)
-
-            db.session.commit()
-            return Todo.query.all()
+        return reports
+
+    def flush_mutations(self):
+        """Write queued local chore and todo edits back to Google Sheets.
+
+        Up to SHEETS_FLUSH_BATCH_SIZE queued edits to existing rows are sent
+        with a single values().batchUpdate; new records are added with
+        values().append so Sheets picks the row. Edits made while a request
+        is in flight stay queued for the next flush. Returns the number of
+        edits sent.
+        """
+        if not self.service or not Config.GOOGLE_SHEETS_ID:
+            return 0
 
+        # The scheduler and a sync request may both try to flush
+        if not _flush_lock.acquire(blocking=False):
+            return 0
+        try:
+            return self._flush_mutations()
+        finally:
+            _flush_lock.release()
+
+    def _flush_mutations(self):
+        mutations = (
+            SheetMutation.pending()
+            .order_by(SheetMutation.id)
+            .limit(Config.SHEETS_FLUSH_BATCH_SIZE)
+            .all()
+        )
+        if not mutations:
+            return 0
+
+        tabs = self._tabs()
+        sent = 0
+        updates = [mutation for mutation in mutations if mutation.op != "append"]
+        appends = [mutation for mutation in mutations if mutation.op == "append"]
+        if updates:
+            sent += self._send_updates(tabs, updates)
+        for mutation in appends:
+            sent += self._send_append(tabs, mutation)
+
+        if sent:
+            print(f"Flushed {sent} edits to Google Sheets")
+        return sent
+
+    def _send_updates(self, tabs, mutations):
+        """Write queued edits to their known sheet rows in one batchUpdate.
+
+        Sheets rejects the whole batch if any edit in it is invalid, so a
+        rejected batch is split in half and each half retried, isolating
+        the bad edit without holding back the others.
+        """
+        data = []
+        for mutation in mutations:
+            sheet_name = tabs[mutation.tab][2].split("!")[0]
+            start, end = mutation.columns.split(":")
+            row = mutation.sheet_row
+            data.append(
+                {
+                    "range": f"{sheet_name}!{start}{row}:{end}{row}",
+                    "values": [mutation.get_values()],
+                }
+            )
+        sent = {mutation.id: mutation.version for mutation in mutations}
+
+        try:
+            upstream.execute(
+                "google_sheets",
+                self.service.spreadsheets()
+                .values()
+                .batchUpdate(
+                    spreadsheetId=Config.GOOGLE_SHEETS_ID,
+                    body={"valueInputOption": "USER_ENTERED", "data": data},
+                ),
+            )
         except Exception as e:
-            print(f"Error syncing todos from sheets: {e}")
-            db.session.rollback()
-            return Todo.query.all()
+            if upstream.is_rejected(e) and len(mutations) > 1:
+                middle = len(mutations) // 2
+                first_half = self._send_updates(tabs, mutations[:middle])
+                return first_half + self._send_updates(tabs, mutations[middle:])
+            print(f"Error flushing {len(data)} sheet edits: {e}")
+            self._record_failure(list(sent), e)
+            return 0
+
+        for mutation_id, version in sent.items():
+            # Delete only if unchanged since it was sent; otherwise the newer
+            # values go out next time
+            SheetMutation.query.filter_by(id=mutation_id, version=version).delete(
+                synchronize_session=False
+            )
+        db.session.commit()
+        return len(data)
+
+    def _send_append(self, tabs, mutation):
+        """Add a new record below a tab's table and remember the row it got.
+
+        values().append finds the end of the table on the sheet itself, so
+        rows added in Sheets since the last download are never overwritten.
+        """
+        # The mutation may be deleted by the commit below
+        mutation_id, tab, version = mutation.id, mutation.tab, mutation.version
+        model, sheet_id, range_name, _ = tabs[tab]
+        sheet_name = range_name.split("!")[0]
+        start, end = mutation.columns.split(":")
 
-    def _sync_icons_from_drive(self):
-        """Download icons from Google Drive to local icons directory."""
         try:
-            drive_service = GoogleDriveService()
-            icons_dir = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)), "static", "icons", "chores"
+            result = upstream.execute(
+                "google_sheets",
+                self.service.spreadsheets()
+                .values()
+                .append(
+                    spreadsheetId=sheet_id,
+                    range=f"{sheet_name}!{start}:{end}",
+                    valueInputOption="USER_ENTERED",
+                    insertDataOption="INSERT_ROWS",
+                    body={"values": [mutation.get_values()]},
+                ),
             )
-            drive_service.sync_icons_to_local(icons_dir)
         except Exception as e:
-            print(f"Error syncing icons from Drive: {e}")
+            print(f"Error appending to {sheet_name}: {e}")
+            self._record_failure([mutation_id], e)
+            return 0
+
+        updated_range = result.get("updates", {}).get("updatedRange", "")
+        match = re.search(r"![A-Z]+(\d+)", updated_range)
+        sheet_row = int(match.group(1)) if match else None
+        if sheet_row is None:
+            print(f"Could not tell which row {updated_range!r} was appended to")
+
+        record = db.session.get(model, mutation.record_id)
+        if record is not None:
+            record.google_sheet_row = sheet_row
+
+        flushed = SheetMutation.query.filter_by(id=mutation_id, version=version).delete(
+            synchronize_session=False
+        )
+        if not flushed and sheet_row is not None:
+            # Edited while in flight: the newer values go to the new row
+            SheetMutation.query.filter_by(id=mutation_id).update(
+                {"op": "update", "sheet_row": sheet_row},
+                synchronize_session=False,
+            )
+        db.session.commit()
+        get_cache().invalidate(tab)
+        return 1
+
+    def _record_failure(self, mutation_ids, error):
+        """Note a failed send, giving up on edits Sheets keeps rejecting.
+
+        Outages and throttling are not counted, so edits made while offline
+        are never given up on.
+        """
+        db.session.rollback()
+        changes = {SheetMutation.last_error: str(error)}
+        if upstream.is_rejected(error):
+            changes[SheetMutation.attempts] = SheetMutation.attempts + 1
+        failed = SheetMutation.query.filter(SheetMutation.id.in_(mutation_ids))
+        failed.update(changes, synchronize_session=False)
+
+        abandoned = failed.filter(
+            SheetMutation.attempts >= Config.SHEETS_MUTATION_MAX_ATTEMPTS
+        ).update(
+            {SheetMutation.abandoned_at: datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.session.commit()
+        if abandoned:
+            print(f"Gave up on {abandoned} sheet edits rejected by Google Sheets")
+
+    def _tabs(self):
+        """Model, spreadsheet, range and row parser of each synced tab."""
+        return {
+            "chores": (
+                Chore,
+                self.chores_sheet_id,
+                f"{Config.CHORES_SHEET_NAME}!A:F",  # Name, Assigned To, Frequency, Day, Icon Name, Completed
+                self._parse_chore_row,
+            ),
+            "todos": (
+                Todo,
+                self.todos_sheet_id,
+                f"{Config.TODOS_SHEET_NAME}!A:E",  # Title, Priority, Assigned To, Due Date, Completed
+                self._parse_todo_row,
+            ),
+        }
+
+    def _parse_chore_row(self, sheet_row, row):
+        """Turn a Chores sheet row into Chore fields, or None if it is incomplete."""
+        # Require at least 3 columns: Name, Assigned To, Frequency
+        # Day and Icon are optional (daily chores may not have a day)
+        if len(row) < 3:
+            return None
+
+        chore_name = row[0] if row[0] else None
+        assigned_to = row[1] if len(row) > 1 and row[1] else None
+
+        # Skip rows with missing essential data
+        if not chore_name or not assigned_to:
+            print(f"Skipping row {sheet_row}: missing name or assigned_to")
+            return None
+
+        # Normalize frequency to lowercase and trim whitespace
+        frequency = row[2].strip().lower() if len(row) > 2 and row[2] else None
+
+        if not frequency:
+            print(f"Skipping row {sheet_row}: missing frequency")
+            return None
+
+        # Normalize day_of_week - convert to full day name if needed
+        # Daily chores may not have a day_of_week column
+        day_of_week = None
+        if len(row) > 3 and row[3]:
+            day_str = row[3].strip()
+            if day_str:  # Only process if day is not empty
+                # Use mapping or original if not found
+                day_of_week = DAY_ABBREVIATIONS.get(day_str.lower(), day_str)
+
+        return {
+            "name": chore_name,
+            "assigned_to": assigned_to,
+            "frequency": frequency,
+            "day_of_week": day_of_week,
+            "icon_name": row[4] if len(row) > 4 and row[4] else None,
+            "google_sheet_row": sheet_row,
+        }
+
+    def _parse_todo_row(self, sheet_row, row):
+        """Turn a Todos sheet row into Todo fields, or None if it is incomplete."""
+        if len(row) < 2:  # Ensure we have enough columns (title and priority)
+            return None
+
+        due_date = None
+        if len(row) > 3 and row[3]:
+            try:
+                due_date = datetime.strptime(row[3], "%Y-%m-%d").date()
+            except ValueError:
+                pass
+
+        return {
+            "title": row[0],
+            "priority": int(row[1]) if len(row) > 1 and row[1].isdigit() else 5,
+            "assigned_to": row[2] if len(row) > 2 else None,
+            "due_date": due_date,
+            "google_sheet_row": sheet_row,
+        }
+
+    def _reconcile_rows(self, model, rows):
+        """Apply parsed sheet rows to a table, writing only what changed.
+
+        Rows are identified by the hash of their content, so an existing
+        record keeps its id (and completion state) while its content is
+        unchanged, even if it moved to another sheet row. A record whose
+        content changed in place is matched by sheet row and updated. The
+        rest are added or deleted. Changes are left for the caller to commit
+        in one transaction.
+
+        Returns counts of unchanged, changed, moved, added and removed rows.
+        """
+        counts = {"unchanged": 0, "changed": 0, "moved": 0, "added": 0, "removed": 0}
+
+        by_hash = {}
+        for record in model.query.order_by(model.google_sheet_row).all():
+            by_hash.setdefault(record.row_hash, []).append(record)
+
+        unmatched = []
+        for fields in rows:
+            row_hash = self._row_hash(fields)
+            candidates = by_hash.get(row_hash)
+            if not candidates:
+                unmatched.append((fields, row_hash))
+                continue
+
+            # Prefer the record already at this sheet row among duplicates
+            record = next(
+                (
+                    candidate
+                    for candidate in candidates
+                    if candidate.google_sheet_row == fields["google_sheet_row"]
+                ),
+                candidates[0],
+            )
+            candidates.remove(record)
+            if record.google_sheet_row == fields["google_sheet_row"]:
+                counts["unchanged"] += 1
+            else:
+                record.google_sheet_row = fields["google_sheet_row"]
+                counts["moved"] += 1
+
+        remaining = [record for records in by_hash.values() for record in records]
+        by_row = {}
+        for record in remaining:
+            by_row.setdefault(record.google_sheet_row, record)
+
+        updated = set()
+        for fields, row_hash in unmatched:
+            record = by_row.pop(fields["google_sheet_row"], None)
+            if record is None:
+                db.session.add(model(row_hash=row_hash, **fields))
+                counts["added"] += 1
+                continue
+
+            for name, value in fields.items():
+                setattr(record, name, value)
+            record.row_hash = row_hash
+            updated.add(id(record))
+            counts["changed"] += 1
+
+        for record in remaining:
+            # Records without a sheet row were created locally and are
+            # still waiting to be written to the sheet
+            if id(record) not in updated and record.google_sheet_row:
+                db.session.delete(record)
+                counts["removed"] += 1
+
+        return counts
+
+    def _row_hash(self, fields):
+        """Hash the sheet content of a row, excluding its position."""
+        content = {
+            name: value.isoformat() if hasattr(value, "isoformat") else value
+            for name, value in fields.items()
+            if name != "google_sheet_row"
+        }
+        return hashlib.sha1(
+            json.dumps(content, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _has_changes(self, report):
+        return any(report.get(key) for key in ("changed", "moved", "added", "removed"))
@@ -0,0 +1,123 @@
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "errors": 0,
+    "retries": 0,
+    "retries_by_reason": {},
+}
+
+
+def _record(key, reason=None):
+    with _stats_lock:
+        _stats[key] += 1
+        if reason is not None:
+            by_reason = _stats["retries_by_reason"]
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+
+
+class JitteredRetry(Retry):
+    """Retry policy with jittered exponential backoff that counts its retries."""
+
+    def get_backoff_time(self):
+        # Spread retries from several clients so they don't hit the API in lockstep
+        backoff = super().get_backoff_time()
+        return backoff * random.uniform(0.5, 1.5) if backoff else 0
+
+    def increment(self, method=None, url=None, response=None, error=None, **kwargs):
+        if response is not None and response.status:
+            reason = str(response.status)
+        elif error is not None:
+            reason = type(error).__name__
+        else:
+            reason = "unknown"
+        # Raises instead once retries are exhausted; that attempt is no retry
+        retry = super().increment(
+            method=method, url=url, response=response, error=error, **kwargs
+        )
+        _record("retries", reason)
+        return retry
+
+
+_session = None
+_adapter = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared keep-alive session used for OpenWeatherMap calls."""
+    global _session, _adapter
+
+    with _session_lock:
+        if _session is None:
+            retry = JitteredRetry(
+                total=Config.HTTP_MAX_RETRIES,
+                # A host that can't be reached is left to the circuit breaker
+                # rather than costing a connect timeout per retry
+                connect=0,
+                backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=frozenset(["GET"]),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            _adapter = HTTPAdapter(
+                pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("https://", _adapter)
+            session.mount("http://", _adapter)
+            _session = session
+        return _session
+
+
+def get(url, params=None, timeout=None):
+    """GET through the pooled session with separate connect and read timeouts."""
+    if timeout is None:
+        timeout = (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT)
+
+    _record("requests")
+    try:
+        return get_session().get(url, params=params, timeout=timeout)
+    except Exception:
+        _record("errors")
+        raise
+
+
+def get_stats():
+    """Request, retry and connection pool statistics for monitoring."""
+    with _stats_lock:
+        stats = dict(_stats, retries_by_reason=dict(_stats["retries_by_reason"]))
+
+    pools = []
+    if _adapter is not None:
+        pool_manager = _adapter.poolmanager
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            pools.append(
+                {
+                    "host": pool.host,
+                    "connections_opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "idle_connections": (
+                        sum(1 for conn in list(pool.pool.queue) if conn)
+                        if pool.pool
+                        else 0
+                    ),
+                }
+            )
+
+    stats["pools"] = pools
+    return stats
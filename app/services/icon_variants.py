@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import threading
+from config import Config
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow is optional, originals are served
+    Image = None
+
+CHORE_ICONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "static", "icons", "chores"
+)
+CHORE_ICONS_URL = "/static/icons/chores"
+VARIANTS_DIRNAME = "variants"
+INDEX_NAME = "index.json"
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
+# Pixel densities rendered for every icon
+SCALES = (1, 2)
+# Extension -> (Pillow format, save options)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "png": ("PNG", {"optimize": True}),
+}
+
+_index_lock = threading.Lock()
+_index = {"mtime": None, "icons": {}}
+
+
+def generate_variants(icons_dir=CHORE_ICONS_DIR):
+    """Render display-sized WebP and PNG variants of every icon in icons_dir.
+
+    Each icon is resized to fit ICON_VARIANT_SIZE at every scale in SCALES.
+    Variants are named after the source's md5, so they are only rendered
+    again when the source changes, and variants of removed or replaced
+    icons are deleted. Returns a report of the run, or None if Pillow is
+    not installed.
+    """
+    if Image is None:
+        return None
+
+    variants_dir = os.path.join(icons_dir, VARIANTS_DIRNAME)
+    os.makedirs(variants_dir, exist_ok=True)
+    index = _read_index(variants_dir)
+
+    icons = {}
+    generated = 0
+    failed = 0
+    for name in sorted(os.listdir(icons_dir)):
+        path = os.path.join(icons_dir, name)
+        if name.startswith(".") or not name.lower().endswith(SOURCE_EXTENSIONS):
+            continue
+
+        try:
+            md5 = file_md5(path)
+            entry = index.get(name)
+            if not (
+                entry and entry["md5"] == md5 and _files_exist(variants_dir, entry)
+            ):
+                entry = _render(path, md5, variants_dir)
+                generated += 1
+            icons[name] = entry
+        except Exception as e:
+            failed += 1
+            print(f"Error generating variants of icon {name}: {e}")
+
+    # Anything not referenced belongs to a removed or replaced icon
+    keep = {INDEX_NAME}
+    for entry in icons.values():
+        keep.update(_variant_files(entry))
+    removed = 0
+    for name in os.listdir(variants_dir):
+        if name not in keep:
+            os.remove(os.path.join(variants_dir, name))
+            removed += 1
+
+    if generated or removed or icons.keys() != index.keys():
+        _write_index(variants_dir, icons)
+
+    return {"generated": generated, "removed": removed, "failed": failed}
+
+
+def get_chore_icon(icon_name):
+    """URLs of the display-sized variants of a chore icon, or None if it has none.
+
+    icon_name may be the icon's file name or its name without extension.
+    """
+    if not icon_name:
+        return None
+
+    icons = _load_index(os.path.join(CHORE_ICONS_DIR, VARIANTS_DIRNAME))
+    entry = icons.get(icon_name) or icons.get(os.path.splitext(icon_name)[0].lower())
+    if entry is None:
+        return None
+
+    def srcset(extension):
+        return ", ".join(
+            f"{_variant_url(entry['variants'][f'{scale}x'][extension])} {scale}x"
+            for scale in SCALES
+        )
+
+    return {
+        "src": _variant_url(entry["variants"]["1x"]["png"]),
+        "srcset": srcset("png"),
+        "webp_srcset": srcset("webp"),
+    }
+
+
+def file_md5(path):
+    """md5 hex digest of a file, the checksum Google Drive reports as md5Checksum."""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _render(path, md5, variants_dir):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    variants = {}
+    with Image.open(path) as source:
+        source = source.convert("RGBA")
+        for scale in SCALES:
+            size = Config.ICON_VARIANT_SIZE * scale
+            image = source.copy()
+            image.thumbnail((size, size), Image.LANCZOS)
+
+            files = {}
+            for extension, (image_format, options) in FORMATS.items():
+                file_name = f"{stem}.{md5[:12]}.{scale}x.{extension}"
+                temp_path = os.path.join(variants_dir, f".{file_name}.part")
+                image.save(temp_path, image_format, **options)
+                os.replace(temp_path, os.path.join(variants_dir, file_name))
+                files[extension] = file_name
+            variants[f"{scale}x"] = files
+
+    return {"md5": md5, "variants": variants}
+
+
+def _variant_files(entry):
+    return [
+        file_name
+        for files in entry["variants"].values()
+        for file_name in files.values()
+    ]
+
+
+def _files_exist(variants_dir, entry):
+    return all(
+        os.path.exists(os.path.join(variants_dir, file_name))
+        for file_name in _variant_files(entry)
+    )
+
+
+def _variant_url(file_name):
+    return f"{CHORE_ICONS_URL}/{VARIANTS_DIRNAME}/{file_name}"
+
+
+def _read_index(variants_dir):
+    try:
+        with open(os.path.join(variants_dir, INDEX_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(variants_dir, icons):
+    path = os.path.join(variants_dir, INDEX_NAME)
+    temp_path = os.path.join(variants_dir, f".{INDEX_NAME}.part")
+    with open(temp_path, "w") as f:
+        json.dump(icons, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def _load_index(variants_dir):
+    """Index of icon name -> variants, re-read only when the file changes."""
+    try:
+        mtime = os.stat(os.path.join(variants_dir, INDEX_NAME)).st_mtime_ns
+    except OSError:
+        return {}
+
+    with _index_lock:
+        if _index["mtime"] != mtime:
+            icons = {}
+            for name, entry in _read_index(variants_dir).items():
+                # Chores may name an icon with or without its extension
+                icons.setdefault(os.path.splitext(name)[0].lower(), entry)
+                icons[name] = entry
+            _index["mtime"] = mtime
+            _index["icons"] = icons
+        return _index["icons"]
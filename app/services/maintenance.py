@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from sqlalchemy import text, tuple_
+from app.models.calendar import CalendarEvent
+from app import db
+from config import Config
+
+
+def prune_calendar_events(now=None):
+    """Delete cached calendar events outside the retention window.
+
+    Keeps CALENDAR_RETENTION_WEEKS_BACK weeks of past events and
+    CALENDAR_RETENTION_WEEKS_AHEAD weeks of future ones, deleting in batches
+    of CALENDAR_PRUNE_BATCH_SIZE so no single transaction holds the database
+    for long. Returns the number of rows deleted.
+    """
+    now = now or datetime.utcnow()
+    oldest = now - timedelta(weeks=Config.CALENDAR_RETENTION_WEEKS_BACK)
+    newest = now + timedelta(weeks=Config.CALENDAR_RETENTION_WEEKS_AHEAD)
+    expired = db.or_(CalendarEvent.end_time < oldest, CalendarEvent.start_time > newest)
+
+    deleted = 0
+    try:
+        while True:
+            keys = (
+                db.session.query(CalendarEvent.id, CalendarEvent.calendar_id)
+                .filter(expired)
+                .limit(Config.CALENDAR_PRUNE_BATCH_SIZE)
+                .all()
+            )
+            if not keys:
+                break
+
+            deleted += CalendarEvent.query.filter(
+                tuple_(CalendarEvent.id, CalendarEvent.calendar_id).in_(
+                    [tuple(key) for key in keys]
+                )
+            ).delete(synchronize_session=False)
+            db.session.commit()
+
+    except Exception as e:
+        print(f"Error pruning calendar events: {e}")
+        db.session.rollback()
+
+    # Windows fetched outside the sync range may have lost their rows
+    from app.services.google_calendar import forget_window_fetches
+
+    forget_window_fetches(oldest, newest)
+
+    return deleted
+
+
+def compact_database():
+    """Return free SQLite pages to the filesystem with an incremental VACUUM.
+
+    The first run switches the database to auto_vacuum=INCREMENTAL, which
+    needs one full VACUUM; later runs only release the free pages.
+    Returns the database size in bytes before and after compaction.
+    """
+    engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return None
+
+    db.session.remove()
+    with engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        size_before = _database_size(connection)
+
+        auto_vacuum = connection.execute(text("PRAGMA auto_vacuum")).scalar()
+        if auto_vacuum != 2:  # 2 = INCREMENTAL
+            connection.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            connection.execute(text("VACUUM"))
+        else:
+            connection.execute(text("PRAGMA incremental_vacuum"))
+
+        size_after = _database_size(connection)
+
+    return {"size_before": size_before, "size_after": size_after}
+
+
+def run_calendar_retention():
+    """Prune expired calendar events and compact the database.
+
+    Returns a report of the rows deleted and bytes reclaimed.
+    """
+    deleted = prune_calendar_events()
+    sizes = compact_database() or {"size_before": None, "size_after": None}
+
+    reclaimed = None
+    if sizes["size_before"] is not None:
+        reclaimed = sizes["size_before"] - sizes["size_after"]
+
+    report = {
+        "rows_deleted": deleted,
+        "bytes_before": sizes["size_before"],
+        "bytes_after": sizes["size_after"],
+        "bytes_reclaimed": reclaimed,
+    }
+    print(f"Calendar retention: deleted {deleted} events, reclaimed {reclaimed} bytes")
+    return report
+
+
+def _database_size(connection):
+    page_count = connection.execute(text("PRAGMA page_count")).scalar()
+    page_size = connection.execute(text("PRAGMA page_size")).scalar()
+    return page_count * page_size
@@ -0,0 +1,86 @@
+import threading
+import time
+from config import Config
+
+
+class QuotaExceeded(Exception):
+    """Raised when a provider's call budget is used up."""
+
+    def __init__(self, provider):
+        super().__init__(f"Upstream quota exhausted for {provider}")
+        self.provider = provider
+
+
+class TokenBucket:
+    """Allows `capacity` calls per `period` seconds, refilled continuously."""
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.calls = 0
+        self.throttled = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self.tokens = min(
+            self.capacity, self.tokens + elapsed * self.capacity / self.period
+        )
+
+    def try_acquire(self, tokens=1):
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                self.calls += tokens
+                return True
+            self.throttled += 1
+            return False
+
+    def to_dict(self):
+        with self._lock:
+            self._refill()
+            return {
+                "capacity": self.capacity,
+                "period": self.period,
+                "remaining": int(self.tokens),
+                "calls": self.calls,
+                "throttled": self.throttled,
+            }
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(provider):
+    """Return the token bucket for a provider configured in UPSTREAM_QUOTAS."""
+    with _buckets_lock:
+        bucket = _buckets.get(provider)
+        if bucket is None:
+            limits = Config.UPSTREAM_QUOTAS[provider]
+            bucket = TokenBucket(limits["calls"], limits["period"])
+            _buckets[provider] = bucket
+        return bucket
+
+
+def acquire(provider, tokens=1):
+    """Spend call budget for a provider, raising QuotaExceeded when it is empty.
+
+    Callers already fall back to cached data on errors, so a throttled call
+    is served from the cache instead of reaching the API.
+    """
+    if not get_bucket(provider).try_acquire(tokens):
+        print(f"Throttled {provider} call: quota exhausted")
+        raise QuotaExceeded(provider)
+
+
+def get_stats():
+    """Calls spent and budget remaining for every configured provider."""
+    return {
+        provider: get_bucket(provider).to_dict() for provider in Config.UPSTREAM_QUOTAS
+    }
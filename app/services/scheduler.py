@@ -0,0 +1,204 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class ScheduledJob:
+    """A function run on a fixed interval, at most one run at a time."""
+
+    def __init__(self, name, func, interval, jitter=0.1, initial_delay=None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.initial_delay = initial_delay
+        self.last_run = None
+        self.last_success = None
+        self.last_duration = None
+        self.last_error = None
+        self.next_run = None
+        self.run_count = 0
+        self.error_count = 0
+        self._run_lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._run_lock.locked()
+
+    def next_delay(self):
+        """Seconds until the next run.
+
+        Jitter only ever shortens the wait, so data refreshed on an interval
+        equal to its cache timeout is replaced before it expires.
+        """
+        return self.interval * (1 - random.uniform(0, self.jitter))
+
+    def run(self, app):
+        """Run the job in an app context. Returns False if a run is already in progress."""
+        if not self._run_lock.acquire(blocking=False):
+            return False
+
+        started = time.monotonic()
+        self.last_run = datetime.utcnow()
+        try:
+            with app.app_context():
+                self.func()
+            self.last_success = self.last_run
+            self.last_error = None
+        except Exception as e:
+            self.error_count += 1
+            self.last_error = str(e)
+            print(f"Scheduled job {self.name} failed: {e}")
+        finally:
+            self.run_count += 1
+            self.last_duration = round(time.monotonic() - started, 3)
+            self._run_lock.release()
+
+        return True
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "running": self.running,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_success": (
+                self.last_success.isoformat() if self.last_success else None
+            ),
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "run_count": self.run_count,
+            "error_count": self.error_count,
+        }
+
+
+class Scheduler:
+    """In-process scheduler that keeps upstream data refreshed off the request path.
+
+    Every job gets its own daemon thread, so a slow upstream only delays its
+    own job.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.jobs = {}
+        self._stop = threading.Event()
+        self._threads = []
+
+    def add_job(self, name, func, interval, jitter=0.1, initial_delay=None):
+        self.jobs[name] = ScheduledJob(name, func, interval, jitter, initial_delay)
+
+    def start(self):
+        for job in self.jobs.values():
+            thread = threading.Thread(
+                target=self._run_job_loop,
+                args=(job,),
+                name=f"scheduler-{job.name}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+
+    def run_now(self, name):
+        """Run a job immediately on the calling thread."""
+        job = self.jobs[name]
+        return job.run(self.app)
+
+    def status(self):
+        return {name: job.to_dict() for name, job in self.jobs.items()}
+
+    def _run_job_loop(self, job):
+        # Stagger the first runs so jobs don't all hit the network at startup
+        delay = job.initial_delay
+        if delay is None:
+            delay = random.uniform(5, 30)
+
+        while True:
+            job.next_run = datetime.utcnow() + timedelta(seconds=delay)
+            if self._stop.wait(delay):
+                return
+            job.run(self.app)
+            delay = job.next_delay()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the running scheduler, or None if it was not started."""
+    return _scheduler
+
+
+def start_scheduler(app):
+    """Create and start the background refresh scheduler once per process."""
+    global _scheduler
+
+    if not app.config.get("SCHEDULER_ENABLED", True) or app.testing:
+        return None
+
+    # Under the debug reloader only the child process serves requests
+    if app.debug and os.environ.get("WERKZEUG_RUN_MAIN") != "true":
+        return None
+
+    with _scheduler_lock:
+        if _scheduler is not None:
+            return _scheduler
+
+        from app.services.google_calendar import GoogleCalendarService
+        from app.services.google_drive import sync_chore_icons
+        from app.services.google_sheets import GoogleSheetsService
+        from app.services.maintenance import run_calendar_retention
+        from app.services.weather_api import WeatherService
+
+        config = app.config
+        scheduler = Scheduler(app)
+        scheduler.add_job(
+            "weather",
+            # Refresh whatever would expire before the next run
+            lambda: WeatherService().get_all_weather_data(
+                refresh_ahead=config["WEATHER_CACHE_TIMEOUT"]
+            ),
+            config["WEATHER_CACHE_TIMEOUT"],
+        )
+        scheduler.add_job(
+            "calendar",
+            lambda: GoogleCalendarService().get_events_from_all_calendars(
+                *_current_week()
+            ),
+            config["CALENDAR_CACHE_TIMEOUT"],
+        )
+        # Chores and todos share a spreadsheet, so they are synced together
+        scheduler.add_job(
+            "sheets",
+            lambda: GoogleSheetsService().sync_all_from_sheets(),
+            min(config["CHORES_CACHE_TIMEOUT"], config["TODOS_CACHE_TIMEOUT"]),
+        )
+        scheduler.add_job(
+            "sheets_flush",
+            lambda: GoogleSheetsService().flush_mutations(),
+            config["SHEETS_FLUSH_INTERVAL"],
+        )
+        scheduler.add_job("icons", sync_chore_icons, config["ICON_SYNC_INTERVAL"])
+        scheduler.add_job(
+            "calendar_retention",
+            run_calendar_retention,
+            config["CALENDAR_RETENTION_INTERVAL"],
+            initial_delay=config["CALENDAR_RETENTION_INTERVAL"],
+        )
+        scheduler.start()
+
+        _scheduler = scheduler
+        return scheduler
+
+
+def _current_week():
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start_of_week = today - timedelta(days=today.weekday())
+    return start_of_week, start_of_week + timedelta(days=7)
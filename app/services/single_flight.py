@@ -0,0 +1,69 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_calls = {}
+_lock = threading.Lock()
+_stats = {"executed": 0, "deduplicated": 0, "by_namespace": {}}
+
+
+def do(key, func, *args, **kwargs):
+    """Run func once for all concurrent callers asking for the same key.
+
+    The first caller runs func; callers arriving while it is in flight wait
+    for it and get the same result (or exception) instead of repeating the
+    upstream request. Keys are tuples whose first item names the resource
+    type, which is used to group the statistics.
+    """
+    with _lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _Call()
+            _calls[key] = call
+        _count(key[0], "executed" if leader else "deduplicated")
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = func(*args, **kwargs)
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _lock:
+            del _calls[key]
+        call.done.set()
+
+
+def _count(namespace, outcome):
+    _stats[outcome] += 1
+    counts = _stats["by_namespace"].setdefault(
+        namespace, {"executed": 0, "deduplicated": 0}
+    )
+    counts[outcome] += 1
+
+
+def get_stats():
+    """How many calls ran upstream and how many shared another caller's result."""
+    with _lock:
+        return {
+            "executed": _stats["executed"],
+            "deduplicated": _stats["deduplicated"],
+            "in_flight": len(_calls),
+            "by_namespace": {
+                namespace: dict(counts)
+                for namespace, counts in _stats["by_namespace"].items()
+            },
+        }
@@ -0,0 +1,53 @@
+from . import circuit_breaker, quota
+
+
+def call(provider, func, *args, **kwargs):
+    """Call an external API on behalf of a provider.
+
+    The call is refused with CircuitOpen while the provider's circuit is
+    open and with QuotaExceeded when its budget is spent; callers fall back
+    to cached data on either.
+    """
+    breaker = circuit_breaker.get_breaker(provider)
+    breaker.before_call()
+    try:
+        quota.acquire(provider)
+    except quota.QuotaExceeded:
+        breaker.release()
+        raise
+
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        if _is_upstream_failure(e):
+            breaker.record_failure(e)
+        else:
+            breaker.record_success()
+        raise
+
+    breaker.record_success()
+    return result
+
+
+def execute(provider, request, **kwargs):
+    """Execute a googleapiclient request for a provider."""
+    return call(provider, request.execute, **kwargs)
+
+
+def is_rejected(error):
+    """Whether the provider answered and refused the request (e.g. a 400).
+
+    Sending the same request again will fail the same way.
+    """
+    return not _is_upstream_failure(error)
+
+
+def _is_upstream_failure(error):
+    # An HTTP error below 500 (other than 429) means the service answered.
+    # Google's HttpError carries the status on .resp, requests' on .response
+    status = getattr(getattr(error, "resp", None), "status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return int(status) >= 500 or int(status) == 429
+    return True
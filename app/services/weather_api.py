@@ -1,7 +1,6 @@
-import requests
 from datetime import datetime
-from app.models.weather import WeatherData
-from app import db
+from . import http_session, single_flight, upstream
+from .cache import get_cache
 from config import Config
 
 
@@ -10,54 +9,35 @@ class WeatherService:
         self.api_key = Config.WEATHER_API_KEY
         self.base_url = Config.WEATHER_BASE_URL
         self.location = Config.WEATHER_LOCATION
+        self.use_one_call = Config.WEATHER_USE_ONE_CALL
+        self.one_call_url = Config.WEATHER_ONE_CALL_URL
+        self.cache = get_cache()
+        self.cache_key = f"{self.location['lat']},{self.location['lon']}"
 
     def get_current_weather(self):
         """Get current weather conditions with today's high/low."""
-        try:
-            # Get current weather
-            url = f"{self.base_url}/weather"
-            params = {
-                "lat": self.location["lat"],
-                "lon": self.location["lon"],
-                "appid": self.api_key,
-                "units": "imperial",  # Use Fahrenheit
-            }
+        cached = self._get_cached("current")
+        if cached is not None:
+            return cached
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            # Get today's forecast for high/low
-            forecast_url = f"{self.base_url}/forecast"
-            forecast_response = requests.get(forecast_url, params=params, timeout=10)
-            forecast_response.raise_for_status()
-            forecast_data = forecast_response.json()
-
-            # Calculate today's high/low from forecast
-            today = datetime.now().strftime("%Y-%m-%d")
-            today_temps = []
-            
-            for item in forecast_data["list"]:
-                item_date = datetime.fromtimestamp(item["dt"]).strftime("%Y-%m-%d")
-                if item_date == today:
-                    today_temps.append(item["main"]["temp"])
-
-            current_weather = {
-                "temp": round(data["main"]["temp"]),
-                "description": data["weather"][0]["description"].title(),
-                "main": data["weather"][0]["main"],
-                "temperature": round(data["main"]["temp"]),
-                "condition": data["weather"][0]["main"].lower(),
-                "humidity": data["main"]["humidity"],
-                "wind_speed": data["wind"]["speed"],
-                "icon": self._get_weather_icon(data["weather"][0]["icon"]),
-                "high": round(max(today_temps)) if today_temps else round(data["main"]["temp"]),
-                "low": round(min(today_temps)) if today_temps else round(data["main"]["temp"]),
-                "last_updated": datetime.utcnow().isoformat(),
-            }
+        # Concurrent requests share one upstream fetch
+        return single_flight.do(("weather", "current"), self._refresh_current)
 
-            # Cache the data
-            self._cache_weather_data(current_weather, None, None)
+    def _refresh_current(self):
+        """Fetch current conditions and cache them."""
+        try:
+            if self.use_one_call:
+                data = self._fetch_one_call()
+                current_weather = self._build_current_from_one_call(data)
+                self._cache_weather_data(current_weather, None, None)
+            else:
+                # Today's high/low comes from the forecast, so cache that too
+                data = self._fetch("weather")
+                forecast_data = self._fetch("forecast")
+                current_weather = self._build_current(data, forecast_data)
+                self._cache_weather_data(
+                    current_weather, self._build_forecast(forecast_data), None
+                )
 
             return current_weather
 
@@ -67,85 +47,20 @@ class WeatherService:
 
     def get_forecast(self):
         """Get 5-day weather forecast."""
-        try:
-            url = f"{self.base_url}/forecast"
-            params = {
-                "lat": self.location["lat"],
-                "lon": self.location["lon"],
-                "appid": self.api_key,
-                "units": "imperial",
-            }
-
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
+        cached = self._get_cached("forecast")
+        if cached is not None:
+            return cached
 
-            # Process forecast data (every 3 hours, we want daily)
-            forecast = []
-            daily_data = {}
+        # Concurrent requests share one upstream fetch
+        return single_flight.do(("weather", "forecast"), self._refresh_forecast)
 
-            for item in data["list"]:
-                date_str = item["dt_txt"].split(" ")[0]
-                if date_str not in daily_data:
-                    daily_data[date_str] = {
-                        "temps": [],
-                        "conditions": [],
-                        "precipitation": [],
-                        "icons": [],
-                    }
-
-                daily_data[date_str]["temps"].append(item["main"]["temp"])
-                daily_data[date_str]["conditions"].append(item["weather"][0]["main"])
-                daily_data[date_str]["icons"].append(item["weather"][0]["icon"])
-                if "rain" in item and "3h" in item["rain"]:
-                    daily_data[date_str]["precipitation"].append(item["rain"]["3h"])
-                elif "snow" in item and "3h" in item["snow"]:
-                    daily_data[date_str]["precipitation"].append(item["snow"]["3h"])
-                else:
-                    daily_data[date_str]["precipitation"].append(0)
-
-            # Convert to daily forecast
-            for date_str, data in daily_data.items():
-                # Get the most common condition and its corresponding icon
-                most_common_condition = self._get_most_common(data["conditions"])
-                # Find the best icon that matches the most common condition
-                # Prefer daytime icons (ending with 'd') over night icons (ending with 'n')
-                condition_icon = "partly-cloudy"  # default
-                day_icons = []
-                night_icons = []
-
-                for i, condition in enumerate(data["conditions"]):
-                    if condition == most_common_condition:
-                        icon_code = data["icons"][i]
-                        if icon_code.endswith("d"):
-                            day_icons.append(icon_code)
-                        elif icon_code.endswith("n"):
-                            night_icons.append(icon_code)
-
-                # Prefer daytime icons, fall back to night icons
-                if day_icons:
-                    condition_icon = self._get_weather_icon(day_icons[0])
-                elif night_icons:
-                    condition_icon = self._get_weather_icon(night_icons[0])
-
-                # Map the condition to a more descriptive name based on the icon
-                descriptive_condition = self._get_descriptive_condition(
-                    most_common_condition, condition_icon
-                )
-
-                forecast.append(
-                    {
-                        "date": date_str,
-                        "high": round(max(data["temps"])),
-                        "low": round(min(data["temps"])),
-                        "condition": descriptive_condition,
-                        "icon": condition_icon,
-                        "precipitation_chance": min(
-                            100, sum(data["precipitation"]) * 10
-                        ),  # Rough calculation
-                    }
-                )
+    def _refresh_forecast(self):
+        """Fetch the forecast and cache it."""
+        try:
+            if self.use_one_call:
+                forecast = self._build_forecast_from_one_call(self._fetch_one_call())
+            else:
+                forecast = self._build_forecast(self._fetch("forecast"))
 
             # Cache the data
             self._cache_weather_data(None, forecast, None)
@@ -158,31 +73,20 @@ class WeatherService:
 
     def get_weather_alerts(self):
         """Get weather alerts (if available)."""
-        try:
-            url = f"{self.base_url}/onecall"
-            params = {
-                "lat": self.location["lat"],
-                "lon": self.location["lon"],
-                "appid": self.api_key,
-                "exclude": "minutely,hourly,daily",
-            }
+        cached = self._get_cached("alerts")
+        if cached is not None:
+            return cached
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-            alerts = data.get("alerts", [])
+        # Concurrent requests share one upstream fetch
+        return single_flight.do(("weather", "alerts"), self._refresh_alerts)
 
-            processed_alerts = []
-            for alert in alerts:
-                processed_alerts.append(
-                    {
-                        "title": alert.get("event", "Weather Alert"),
-                        "description": alert.get("description", ""),
-                        "severity": alert.get("severity", "moderate"),
-                        "expires": alert.get("expires", ""),
-                    }
-                )
+    def _refresh_alerts(self):
+        """Fetch weather alerts and cache them."""
+        try:
+            if self.use_one_call:
+                processed_alerts = self._build_alerts(self._fetch_one_call())
+            else:
+                processed_alerts = self._build_alerts(self._fetch_alerts())
 
             # Cache the data
             self._cache_weather_data(None, None, processed_alerts)
@@ -193,76 +97,353 @@ class WeatherService:
             print(f"Error fetching weather alerts: {e}")
             return self._get_cached_alerts()
 
-    def get_all_weather_data(self):
-        """Get all weather data (current, forecast, alerts)."""
-        current = self.get_current_weather()
-        forecast = self.get_forecast()
-        alerts = self.get_weather_alerts()
+    def get_all_weather_data(self, refresh_ahead=0):
+        """Get all weather data (current, forecast, alerts).
+
+        Components still within their cache timeout are served from the
+        cache; only the stale ones are fetched. refresh_ahead (seconds)
+        also refreshes components that would expire within that time, which
+        lets the scheduler replace data before readers see it expire.
+
+        Each upstream endpoint is called at most once per refresh: a single
+        One Call request when enabled, otherwise /weather, /forecast and the
+        alerts endpoint, with the forecast payload shared between current
+        conditions (today's high/low) and the daily forecast.
+        """
+        cached = {
+            component: self._get_cached(component, ahead=refresh_ahead)
+            for component in ("current", "forecast", "alerts")
+        }
+        if all(value is not None for value in cached.values()):
+            return self._with_updated(cached)
 
-        return {"current": current, "forecast": forecast, "alerts": alerts}
+        return single_flight.do(("weather", "all"), self._refresh_all, cached)
 
-    def _cache_weather_data(self, current, forecast, alerts):
-        """Cache weather data in database."""
+    def _refresh_all(self, cached):
+        """Fetch the components missing from `cached` and cache them."""
+        if self.use_one_call:
+            try:
+                data = self._fetch_one_call()
+                current = self._build_current_from_one_call(data)
+                forecast = self._build_forecast_from_one_call(data)
+                alerts = self._build_alerts(data)
+                self._cache_weather_data(current, forecast, alerts)
+                return self._with_updated(
+                    {"current": current, "forecast": forecast, "alerts": alerts}
+                )
+            except Exception as e:
+                print(f"Error fetching One Call weather data: {e}")
+                return self._with_updated(
+                    {
+                        "current": self._get_cached_weather(),
+                        "forecast": self._get_cached_forecast(),
+                        "alerts": self._get_cached_alerts(),
+                    }
+                )
+
+        # Current conditions need the forecast payload for today's high/low
+        fetches = []
+        if cached["current"] is None:
+            fetches.append(("weather", lambda: self._fetch("weather")))
+        if cached["current"] is None or cached["forecast"] is None:
+            fetches.append(("forecast", lambda: self._fetch("forecast")))
+        if cached["alerts"] is None:
+            fetches.append(("alerts", self._fetch_alerts))
+
+        payloads = {}
+        for name, fetch in fetches:
+            try:
+                payloads[name] = fetch()
+            except Exception as e:
+                print(f"Error fetching weather {name}: {e}")
+
+        current = forecast = alerts = None
         try:
-            weather_data = WeatherData.query.first()
-            if not weather_data:
-                weather_data = WeatherData()
-                db.session.add(weather_data)
+            if "weather" in payloads:
+                current = self._build_current(
+                    payloads["weather"], payloads.get("forecast")
+                )
+            if "forecast" in payloads:
+                forecast = self._build_forecast(payloads["forecast"])
+            if "alerts" in payloads:
+                alerts = self._build_alerts(payloads["alerts"])
+        except Exception as e:
+            print(f"Error processing weather data: {e}")
+
+        if alerts is None and cached["alerts"] is None:
+            # The alerts endpoint needs a One Call subscription the key may
+            # lack; keep the last known alerts until the next attempt is due
+            # instead of asking again on every request
+            alerts = self._get_cached_alerts()
+
+        # Cache the data
+        self._cache_weather_data(current, forecast, alerts)
+
+        for component, value in (
+            ("current", current),
+            ("forecast", forecast),
+            ("alerts", alerts),
+        ):
+            if value is not None:
+                cached[component] = value
+
+        return self._with_updated(
+            {
+                "current": (
+                    cached["current"]
+                    if cached["current"] is not None
+                    else self._get_cached_weather()
+                ),
+                "forecast": (
+                    cached["forecast"]
+                    if cached["forecast"] is not None
+                    else self._get_cached_forecast()
+                ),
+                "alerts": (
+                    cached["alerts"]
+                    if cached["alerts"] is not None
+                    else self._get_cached_alerts()
+                ),
+            }
+        )
+
+    def _params(self, **extra):
+        params = {
+            "lat": self.location["lat"],
+            "lon": self.location["lon"],
+            "appid": self.api_key,
+            "units": "imperial",  # Use Fahrenheit
+        }
+        params.update(extra)
+        return params
 
-            if current:
-                weather_data.set_current_data(current)
-            if forecast:
-                weather_data.set_forecast_data(forecast)
-            if alerts:
-                weather_data.set_alerts_data(alerts)
+    def _fetch(self, endpoint, params=None, url=None):
+        """Call an OpenWeatherMap endpoint and return the decoded JSON."""
+        url = url or f"{self.base_url}/{endpoint}"
 
-            db.session.commit()
+        def get():
+            # Raised inside the call so 5xx and 429 answers count against
+            # the circuit breaker
+            response = http_session.get(url, params=params or self._params())
+            response.raise_for_status()
+            return response
 
-        except Exception as e:
-            print(f"Error caching weather data: {e}")
-            try:
-                db.session.rollback()
-            except:
-                pass
+        return upstream.call("openweather", get).json()
 
-    def _get_cached_weather(self):
-        """Get cached weather data if still valid."""
-        try:
-            weather_data = WeatherData.query.first()
-            if weather_data and weather_data.get_current_data():
-                # Check if cache is still valid (within 10 minutes)
-                cache_age = datetime.utcnow() - weather_data.last_updated
-                if cache_age.total_seconds() < Config.WEATHER_CACHE_TIMEOUT:
-                    return weather_data.get_current_data()
+    def _fetch_alerts(self):
+        return self._fetch(
+            "onecall",
+            params={
+                "lat": self.location["lat"],
+                "lon": self.location["lon"],
+                "appid": self.api_key,
+                "exclude": "minutely,hourly,daily",
+            },
+        )
+
+    def _fetch_one_call(self):
+        """Fetch current conditions, daily forecast and alerts in one request."""
+        return self._fetch(
+            "onecall",
+            params=self._params(exclude="minutely,hourly"),
+            url=self.one_call_url,
+        )
+
+    def _build_current(self, data, forecast_data=None):
+        """Build current conditions from /weather and today's temps from /forecast."""
+        # Calculate today's high/low from forecast
+        today = datetime.now().strftime("%Y-%m-%d")
+        today_temps = []
+
+        for item in (forecast_data or {}).get("list", []):
+            item_date = datetime.fromtimestamp(item["dt"]).strftime("%Y-%m-%d")
+            if item_date == today:
+                today_temps.append(item["main"]["temp"])
+
+        return {
+            "temp": round(data["main"]["temp"]),
+            "description": data["weather"][0]["description"].title(),
+            "main": data["weather"][0]["main"],
+            "temperature": round(data["main"]["temp"]),
+            "condition": data["weather"][0]["main"].lower(),
+            "humidity": data["main"]["humidity"],
+            "wind_speed": data["wind"]["speed"],
+            "icon": self._get_weather_icon(data["weather"][0]["icon"]),
+            "high": round(max(today_temps)) if today_temps else round(data["main"]["temp"]),
+            "low": round(min(today_temps)) if today_temps else round(data["main"]["temp"]),
+            "last_updated": datetime.utcnow().isoformat(),
+        }
+
+    def _build_current_from_one_call(self, data):
+        current = data["current"]
+        today = (data.get("daily") or [{}])[0].get("temp", {})
+        return {
+            "temp": round(current["temp"]),
+            "description": current["weather"][0]["description"].title(),
+            "main": current["weather"][0]["main"],
+            "temperature": round(current["temp"]),
+            "condition": current["weather"][0]["main"].lower(),
+            "humidity": current["humidity"],
+            "wind_speed": current["wind_speed"],
+            "icon": self._get_weather_icon(current["weather"][0]["icon"]),
+            "high": round(today.get("max", current["temp"])),
+            "low": round(today.get("min", current["temp"])),
+            "last_updated": datetime.utcnow().isoformat(),
+        }
+
+    def _build_forecast(self, data):
+        """Build the daily forecast from the 3-hourly /forecast payload."""
+        # Process forecast data (every 3 hours, we want daily)
+        forecast = []
+        daily_data = {}
+
+        for item in data["list"]:
+            date_str = item["dt_txt"].split(" ")[0]
+            if date_str not in daily_data:
+                daily_data[date_str] = {
+                    "temps": [],
+                    "conditions": [],
+                    "precipitation": [],
+                    "icons": [],
+                }
+
+            daily_data[date_str]["temps"].append(item["main"]["temp"])
+            daily_data[date_str]["conditions"].append(item["weather"][0]["main"])
+            daily_data[date_str]["icons"].append(item["weather"][0]["icon"])
+            if "rain" in item and "3h" in item["rain"]:
+                daily_data[date_str]["precipitation"].append(item["rain"]["3h"])
+            elif "snow" in item and "3h" in item["snow"]:
+                daily_data[date_str]["precipitation"].append(item["snow"]["3h"])
+            else:
+                daily_data[date_str]["precipitation"].append(0)
+
+        # Convert to daily forecast
+        for date_str, data in daily_data.items():
+            # Get the most common condition and its corresponding icon
+            most_common_condition = self._get_most_common(data["conditions"])
+            # Find the best icon that matches the most common condition
+            # Prefer daytime icons (ending with 'd') over night icons (ending with 'n')
+            condition_icon = "partly-cloudy"  # default
+            day_icons = []
+            night_icons = []
+
+            for i, condition in enumerate(data["conditions"]):
+                if condition == most_common_condition:
+                    icon_code = data["icons"][i]
+                    if icon_code.endswith("d"):
+                        day_icons.append(icon_code)
+                    elif icon_code.endswith("n"):
+                        night_icons.append(icon_code)
+
+            # Prefer daytime icons, fall back to night icons
+            if day_icons:
+                condition_icon = self._get_weather_icon(day_icons[0])
+            elif night_icons:
+                condition_icon = self._get_weather_icon(night_icons[0])
+
+            # Map the condition to a more descriptive name based on the icon
+            descriptive_condition = self._get_descriptive_condition(
+                most_common_condition, condition_icon
+            )
+
+            forecast.append(
+                {
+                    "date": date_str,
+                    "high": round(max(data["temps"])),
+                    "low": round(min(data["temps"])),
+                    "condition": descriptive_condition,
+                    "icon": condition_icon,
+                    "precipitation_chance": min(
+                        100, sum(data["precipitation"]) * 10
+                    ),  # Rough calculation
+                }
+            )
+
+        return forecast
+
+    def _build_forecast_from_one_call(self, data):
+        forecast = []
+        timezone_offset = data.get("timezone_offset", 0)
+        for day in data.get("daily", [])[:5]:
+            condition = day["weather"][0]["main"]
+            icon = self._get_weather_icon(day["weather"][0]["icon"])
+            forecast.append(
+                {
+                    "date": datetime.utcfromtimestamp(
+                        day["dt"] + timezone_offset
+                    ).strftime("%Y-%m-%d"),
+                    "high": round(day["temp"]["max"]),
+                    "low": round(day["temp"]["min"]),
+                    "condition": self._get_descriptive_condition(condition, icon),
+                    "icon": icon,
+                    "precipitation_chance": round(day.get("pop", 0) * 100),
+                }
+            )
+        return forecast
+
+    def _build_alerts(self, data):
+        processed_alerts = []
+        for alert in data.get("alerts", []):
+            processed_alerts.append(
+                {
+                    "title": alert.get("event", "Weather Alert"),
+                    "description": alert.get("description", ""),
+                    "severity": alert.get("severity", "moderate"),
+                    "expires": alert.get("expires", alert.get("end", "")),
+                }
+            )
+        return processed_alerts
+
+    def _cache_weather_data(self, current, forecast, alerts):
+        """Cache weather data in the weather_* cache namespaces.
+
+        Only the components passed in are written, so each keeps its own
+        fetch time. An empty alerts list is cached too: "no alerts" is fresh
+        data.
+        """
+        for component, data in (
+            ("current", current),
+            ("forecast", forecast),
+            ("alerts", alerts),
+        ):
+            if data is not None:
+                self.cache.set(f"weather_{component}", self.cache_key, data)
+
+    def _get_cached(self, component, ahead=0):
+        """Get a cached component if it is still within its cache timeout.
+
+        Returns None when the component is missing or would expire within
+        `ahead` seconds.
+        """
+        entry = self.cache.get_entry(f"weather_{component}", self.cache_key)
+        if entry is None:
             return None
-        except Exception:
+        if (entry.expires_at - datetime.utcnow()).total_seconds() <= ahead:
             return None
+        return entry.value
+
+    def _get_cached_weather(self):
+        """Get the last cached weather data after an upstream failure."""
+        return self.cache.get("weather_current", self.cache_key, allow_stale=True)
 
     def _get_cached_forecast(self):
-        """Get cached forecast data if still valid."""
-        try:
-            weather_data = WeatherData.query.first()
-            if weather_data and weather_data.get_forecast_data():
-                # Check if cache is still valid (within 10 minutes)
-                cache_age = datetime.utcnow() - weather_data.last_updated
-                if cache_age.total_seconds() < Config.WEATHER_CACHE_TIMEOUT:
-                    return weather_data.get_forecast_data()
-            return []
-        except Exception:
-            return []
+        """Get the last cached forecast data after an upstream failure."""
+        return (
+            self.cache.get("weather_forecast", self.cache_key, allow_stale=True) or []
+        )
 
     def _get_cached_alerts(self):
-        """Get cached alerts data if still valid."""
-        try:
-            weather_data = WeatherData.query.first()
-            if weather_data and weather_data.get_alerts_data():
-                # Check if cache is still valid (within 10 minutes)
-                cache_age = datetime.utcnow() - weather_data.last_updated
-                if cache_age.total_seconds() < Config.WEATHER_CACHE_TIMEOUT:
-                    return weather_data.get_alerts_data()
-            return []
-        except Exception:
-            return []
+        """Get the last cached alerts data after an upstream failure."""
+        return self.cache.get("weather_alerts", self.cache_key, allow_stale=True) or []
+
+    def _with_updated(self, weather):
+        """Add when each component was last fetched so clients can show its age."""
+        updated = {}
+        for component in ("current", "forecast", "alerts"):
+            entry = self.cache.get_entry(f"weather_{component}", self.cache_key)
+            updated[component] = entry.stored_at.isoformat() if entry else None
+        weather["updated"] = updated
+        return weather
 
     def _get_weather_icon(self, icon_code):
         """Convert OpenWeatherMap icon code to our icon name."""
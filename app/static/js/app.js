@@ -15,6 +15,9 @@ let inProgressChores = new Set();
 // Auto-refresh interval (5 minutes)
 const AUTO_REFRESH_INTERVAL = 5 * 60 * 1000; // 5 minutes in milliseconds
 
+// Delay before re-reading calendar data the server is revalidating in the background
+const CALENDAR_REVALIDATE_DELAY = 5000;
+
 document.addEventListener('DOMContentLoaded', function() {
     initializeApp();
 });
@@ -1056,7 +1059,19 @@ function createChoreTile(chore) {
     
     // Use icon if available, otherwise show default icon
     let iconHtml = '';
-    if (chore.icon_name) {
+    if (chore.icon) {
+        // Display-sized variants: WebP where supported, PNG otherwise
+        iconHtml = `<div class="chore-icon">
+            <picture>
+                <source type="image/webp" srcset="${chore.icon.webp_srcset}" />
+                <img src="${chore.icon.src}" srcset="${chore.icon.srcset}" alt="${chore.name}" decoding="async"
+                     onerror="this.parentElement.style.display='none'; this.parentElement.nextElementSibling.style.display='flex';" />
+            </picture>
+            <div class="chore-icon-fallback" style="display: none;">
+                <i class="fas fa-tasks"></i>
+            </div>
+        </div>`;
+    } else if (chore.icon_name) {
         iconHtml = `<div class="chore-icon">
             <img src="/static/icons/chores/${chore.icon_name}" alt="${chore.name}" 
                  onerror="this.style.display='none'; this.nextElementSibling.style.display='flex';" />
@@ -1360,7 +1375,7 @@ function completeTodo(todoId) {
 // Calendar functions
 let calendarEvents = [];
 
-function loadCalendarData(forceRefresh = false) {
+function loadCalendarData(forceRefresh = false, isRevalidation = false) {
     console.log('Loading calendar data', forceRefresh ? '(forced refresh)' : '');
     
     // Check cache first unless forcing refresh
@@ -1384,6 +1399,12 @@ function loadCalendarData(forceRefresh = false) {
                 tabCache.calendar.lastLoaded = Date.now();
                 
                 displayCalendar();
+                
+                // Stale data was served while the server refreshes it; pick up the fresh copy shortly.
+                // Only once per load: if the refresh failed, the data stays stale until the next load.
+                if (data.revalidating && !isRevalidation) {
+                    setTimeout(() => loadCalendarData(true, true), CALENDAR_REVALIDATE_DELAY);
+                }
             } else {
                 showError('Failed to load calendar: ' + (data.error || 'Unknown error'));
             }
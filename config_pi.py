@@ -52,6 +52,32 @@ class Config:
     # TODO: Get your free API key from https://openweathermap.org/api
     WEATHER_API_KEY = os.environ.get("WEATHER_API_KEY") or "YOUR_WEATHER_API_KEY_HERE"
     WEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5"
+    # One Call 3.0 returns current, daily forecast and alerts in a single request,
+    # but needs a key subscribed to it
+    WEATHER_USE_ONE_CALL = os.environ.get("WEATHER_ONE_CALL", "false").lower() == "true"
+    WEATHER_ONE_CALL_URL = "https://api.openweathermap.org/data/3.0/onecall"
+
+    # Pooled HTTP session for OpenWeatherMap
+    HTTP_CONNECT_TIMEOUT = 3.05  # seconds to establish a connection
+    HTTP_READ_TIMEOUT = 10  # seconds to wait for a response
+    HTTP_MAX_RETRIES = 3  # retries on 429, 5xx and dropped responses
+    HTTP_BACKOFF_FACTOR = 0.5  # exponential backoff base, jittered
+    HTTP_POOL_CONNECTIONS = 2
+    HTTP_POOL_MAXSIZE = 4
+
+    # Upstream call budgets (token buckets: `calls` per `period` seconds).
+    # Throttled calls are answered from the cache.
+    UPSTREAM_QUOTAS = {
+        "openweather": {"calls": 50, "period": 60},  # API limit is 60/minute
+        "google_calendar": {"calls": 300, "period": 60},
+        "google_sheets": {"calls": 50, "period": 60},  # 60 reads/minute per user
+        "google_drive": {"calls": 300, "period": 60},
+    }
+
+    # Circuit breakers: stop calling an unreachable upstream and serve the cache
+    CIRCUIT_FAILURE_THRESHOLD = 3  # consecutive failures before opening
+    CIRCUIT_RESET_TIMEOUT = 60  # seconds open before a trial request
+    CIRCUIT_HALF_OPEN_MAX_CALLS = 1  # concurrent trial requests while half-open
 
     # TODO: Set your location coordinates
     WEATHER_LOCATION = {
@@ -63,14 +89,52 @@ class Config:
     # Cache Configuration - Optimized for Pi Zero W
     CACHE_DEFAULT_TIMEOUT = 1800  # 30 minutes (longer for Pi Zero W)
     WEATHER_CACHE_TIMEOUT = 1800  # 30 minutes (safe for API limits)
+    WEATHER_FORECAST_CACHE_TIMEOUT = 3600  # 1 hour (the 5-day forecast changes slowly)
+    WEATHER_ALERTS_CACHE_TIMEOUT = 1800  # same as current conditions
     CALENDAR_CACHE_TIMEOUT = 1800  # 30 minutes
+    CALENDAR_LIST_CACHE_TIMEOUT = 21600  # 6 hours (calendar names/colors rarely change)
+    CALENDAR_FETCH_WORKERS = 4  # concurrent per-calendar requests to Google
+    CALENDAR_SYNC_WEEKS_BACK = 4  # weeks before this one kept in incremental sync
+    CALENDAR_SYNC_WEEKS_AHEAD = 12  # weeks after this one kept in incremental sync
+    CALENDAR_MAX_RANGE_WEEKS = 8  # most weeks returned by /calendar/api/events/range
+    CALENDAR_RETENTION_WEEKS_BACK = 8  # cached events kept this many weeks back
+    CALENDAR_RETENTION_WEEKS_AHEAD = 26  # and this many weeks ahead
+    CALENDAR_PRUNE_BATCH_SIZE = 500  # rows deleted per retention transaction
+    CALENDAR_RETENTION_INTERVAL = 86400  # run the retention job daily
 
     # Reduced cache timeouts for better responsiveness
     CHORES_CACHE_TIMEOUT = 900  # 15 minutes
     TODOS_CACHE_TIMEOUT = 900  # 15 minutes
+    SHEETS_FLUSH_INTERVAL = 30  # seconds between pushes of local edits to Sheets
+    SHEETS_FLUSH_BATCH_SIZE = 100  # most queued edits sent in one batchUpdate
+    SHEETS_MUTATION_MAX_ATTEMPTS = 5  # rejections before an edit is given up on
+    ICON_DOWNLOAD_WORKERS = 4  # concurrent icon downloads from Google Drive
+    ICON_DOWNLOAD_CHUNK_SIZE = 256 * 1024  # bytes fetched per download request
+    ICON_SYNC_INTERVAL = 3600  # check the Drive icons folder hourly
+    ICON_FULL_SYNC_INTERVAL = 86400  # list it daily even if the folder looks unchanged
+
+    # Two-tier cache (in-memory LRU in front of SQLite), app/services/cache.py
+    # 512 KB in-memory tier (Pi Zero W has 512 MB RAM)
+    CACHE_MEMORY_MAX_BYTES = 512 * 1024
+    CACHE_DB_MAX_BYTES = 4 * 1024 * 1024  # 4 MB SQLite tier
+    CACHE_NAMESPACES = {
+        "weather_current": {"timeout": WEATHER_CACHE_TIMEOUT},
+        "weather_forecast": {"timeout": WEATHER_FORECAST_CACHE_TIMEOUT},
+        "weather_alerts": {"timeout": WEATHER_ALERTS_CACHE_TIMEOUT},
+        "calendar_list": {"timeout": CALENDAR_LIST_CACHE_TIMEOUT},
+        # When weeks outside the sync range were last fetched, per calendar
+        "calendar_windows": {"timeout": CALENDAR_CACHE_TIMEOUT},
+        # Chores and todos already live in SQLite, so only keep them in memory
+        "chores": {"timeout": CHORES_CACHE_TIMEOUT, "persistent": False},
+        "todos": {"timeout": TODOS_CACHE_TIMEOUT, "persistent": False},
+    }
+
+    # Background refresh scheduler (keeps upstream fetches off the request path)
+    SCHEDULER_ENABLED = os.environ.get("HOMEVIEW_SCHEDULER", "true").lower() == "true"
 
     # UI Configuration - Optimized for touch screens
     TOUCH_TARGET_SIZE = 48  # Larger touch targets for Pi Zero W
+    ICON_VARIANT_SIZE = 80  # px box chore icons are drawn in (.chore-icon in style.css)
     TOUCH_FRIENDLY = True  # Enable touch-friendly UI features
 
     # Performance optimizations for Pi Zero W
@@ -5,11 +5,25 @@ Simple test script to verify the HomeView application works correctly.
 
 import sys
 import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import httplib2
+import pytest
+from google.oauth2.credentials import Credentials
+from googleapiclient.errors import HttpError
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app, db
-from app.models import CalendarEvent, Chore, Todo, WeatherData
+from app.models import CalendarEvent, Chore, SheetMutation, Todo, WeatherData
+from app.services import google_calendar, google_sheets
+from app.services.auth import CredentialStore
+from app.services.cache import get_cache
+from app.services.google_drive import GoogleDriveService
+from app.services.google_sheets import GoogleSheetsService
+from config import Config
 
 
 def test_app_creation():
@@ -119,6 +133,318 @@ def test_routes():
         print(f"❌ Route test failed: {e}")
 
 
+def _credentials(expires_in):
+    return Credentials(
+        token="access",
+        refresh_token="refresh",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="client",
+        client_secret="secret",
+        scopes=Config.GOOGLE_SCOPES,
+        expiry=datetime.utcnow() + expires_in,
+    )
+
+
+@pytest.mark.parametrize("action", ["save", "clear"])
+def test_credentials_change_during_refresh(tmp_path, monkeypatch, action):
+    """Test that saving or clearing credentials while a refresh runs completes."""
+    refreshing = threading.Event()
+
+    def slow_refresh(creds, request):
+        refreshing.set()
+        time.sleep(0.5)
+        creds.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, "refresh", slow_refresh)
+    store = CredentialStore(str(tmp_path / "token.json"), Config.GOOGLE_SCOPES)
+
+    # Expiring soon, so the refresh timer fires right away
+    store.save(_credentials(timedelta(minutes=1)))
+    assert refreshing.wait(5)
+
+    new_creds = _credentials(timedelta(hours=1))
+    if action == "save":
+        worker = threading.Thread(target=store.save, args=(new_creds,), daemon=True)
+    else:
+        worker = threading.Thread(target=store.clear, daemon=True)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive()
+
+    if action == "save":
+        assert store.get() is new_creds
+    else:
+        assert store.get() is None
+        assert not os.path.exists(store.token_file)
+    print(f"✅ Credentials {action} during a refresh completes")
+
+
+class FakeRequest:
+    def __init__(self, run):
+        self._run = run
+
+    def execute(self, **kwargs):
+        return self._run()
+
+
+class FakeSheets:
+    """In-memory stand-in for the Sheets v4 client.
+
+    tabs maps a sheet name to its rows. Edits the reject predicate returns
+    True for fail their whole batchUpdate with a 400, like Sheets does.
+    """
+
+    def __init__(self, tabs):
+        self.tabs = tabs
+        self.calls = []
+        self.reject = lambda data: False
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def batchGet(self, spreadsheetId, ranges):
+        self.calls.append("batchGet")
+        return FakeRequest(
+            lambda: {
+                "valueRanges": [
+                    {"range": r, "values": [list(row) for row in self._rows(r)]}
+                    for r in ranges
+                ]
+            }
+        )
+
+    def batchUpdate(self, spreadsheetId, body):
+        self.calls.append("batchUpdate")
+
+        def run():
+            if any(self.reject(data) for data in body["data"]):
+                raise HttpError(httplib2.Response({"status": "400"}), b"rejected")
+            for data in body["data"]:
+                self._write(data["range"], data["values"][0])
+            return {"totalUpdatedRows": len(body["data"])}
+
+        return FakeRequest(run)
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        self.calls.append("append")
+
+        def run():
+            rows = self._rows(range)
+            while rows and not any(rows[-1]):
+                rows.pop()
+            rows.append(list(body["values"][0]))
+            sheet_name = range.split("!")[0]
+            return {
+                "updates": {"updatedRange": f"{sheet_name}!A{len(rows)}:E{len(rows)}"}
+            }
+
+        return FakeRequest(run)
+
+    def _rows(self, range_name):
+        return self.tabs[range_name.split("!")[0]]
+
+    def _write(self, range_name, values):
+        rows = self._rows(range_name)
+        cell = range_name.split("!")[1].split(":")[0]
+        column = ord(cell[0]) - ord("A")
+        row_number = int(cell[1:])
+        while len(rows) < row_number:
+            rows.append([])
+        row = rows[row_number - 1]
+        row.extend([""] * (column + len(values) - len(row)))
+        row[column : column + len(values)] = values
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """An app on a fresh database, without the background scheduler."""
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}"
+    )
+    monkeypatch.setattr(Config, "SCHEDULER_ENABLED", False)
+    get_cache().clear_memory()
+
+    app = create_app()
+    with app.app_context():
+        yield app
+    get_cache().clear_memory()
+
+
+@pytest.fixture
+def sheets(app, monkeypatch):
+    """A FakeSheets standing in for the app's Google Sheets client."""
+    fake = FakeSheets(
+        {
+            "Chores": [["Name", "Assigned To", "Frequency", "Day", "Icon", "Done"]],
+            "Todos": [["Title", "Priority", "Assigned To", "Due Date", "Done"]],
+        }
+    )
+    monkeypatch.setattr(Config, "GOOGLE_SHEETS_ID", "test-sheet")
+    monkeypatch.setattr(google_sheets, "get_google_client", lambda api, v: fake)
+    monkeypatch.setattr(GoogleDriveService, "get_file_version", lambda self, _: None)
+    return fake
+
+
+def test_reconcile_sheet_rows(sheets):
+    """Test that sheet rows are matched to existing todos by content."""
+    service = GoogleSheetsService()
+
+    def reconcile(*rows):
+        parsed = [
+            service._parse_todo_row(i + 2, list(row)) for i, row in enumerate(rows)
+        ]
+        report = service._reconcile_rows(Todo, parsed)
+        db.session.commit()
+        return report
+
+    def ids_by_row():
+        return {todo.google_sheet_row: todo.id for todo in Todo.query.all()}
+
+    report = reconcile(["Milk", "3"], ["Eggs", "2"], ["Milk", "3"], ["Bread", "1"])
+    assert report["added"] == 4
+    before = ids_by_row()
+
+    # Created on the kiosk and not written to the sheet yet
+    local = Todo(title="Local")
+    db.session.add(local)
+    db.session.commit()
+
+    # Eggs moved up, the first Milk moved down, Bread edited in place
+    report = reconcile(["Eggs", "2"], ["Milk", "3"], ["Milk", "3"], ["Bread", "9"])
+    assert report == {
+        "unchanged": 1,
+        "changed": 1,
+        "moved": 2,
+        "added": 0,
+        "removed": 0,
+    }
+    after = ids_by_row()
+    assert after[2] == before[3]  # Eggs
+    assert after[3] == before[2]  # the Milk that moved
+    assert after[4] == before[4]  # the duplicate Milk kept its row and id
+    assert after[5] == before[5]  # Bread
+    assert db.session.get(Todo, before[5]).priority == 9
+
+    # One Milk deleted in the sheet and a new row added
+    report = reconcile(["Eggs", "2"], ["Milk", "3"], ["Bread", "9"], ["Jam", "1"])
+    assert report == {
+        "unchanged": 2,
+        "changed": 0,
+        "moved": 1,
+        "added": 1,
+        "removed": 1,
+    }
+    assert db.session.get(Todo, before[4]) is None
+    assert db.session.get(Todo, local.id) is not None
+    print("✅ Sheet rows reconcile correctly")
+
+
+def test_sheet_mutations_merge_and_flush(sheets):
+    """Test that queued edits are merged per record and flushed in one batch."""
+    sheets.tabs["Chores"] += [["Dishes", "Alex", "daily"], ["Trash", "Sam", "weekly"]]
+    sheets.tabs["Todos"] += [["Milk", "3"]]
+    service = GoogleSheetsService()
+    service.sync_all_from_sheets(force=True)
+
+    dishes = Chore.query.filter_by(name="Dishes").one()
+    dishes.mark_completed()
+    dishes.reset_completion()
+    dishes.mark_completed()
+    todo = Todo.query.one()
+    todo.priority = 7
+    todo.queue_sheet_update()
+    db.session.commit()
+
+    mutations = SheetMutation.query.order_by(SheetMutation.id).all()
+    assert [(m.tab, m.version) for m in mutations] == [("chores", 3), ("todos", 1)]
+    assert mutations[0].get_values() == ["TRUE"]
+
+    sheets.calls.clear()
+    assert service.flush_mutations() == 2
+    assert sheets.calls == ["batchUpdate"]
+    assert sheets.tabs["Chores"][1][5] == "TRUE"
+    assert sheets.tabs["Todos"][1][:2] == ["Milk", "7"]
+    assert SheetMutation.query.count() == 0
+    print("✅ Sheet edits merge and flush correctly")
+
+
+def test_new_todo_does_not_overwrite_sheet_rows(sheets):
+    """Test that a new todo is appended below rows added in Sheets meanwhile."""
+    sheets.tabs["Todos"] += [["Milk", "3"]]
+    service = GoogleSheetsService()
+    service.sync_todos_from_sheets(force=True)
+
+    # Added in Sheets after the last download
+    sheets.tabs["Todos"].append(["Sheet todo", "1"])
+
+    todo = Todo(title="Kiosk todo", priority=4)
+    db.session.add(todo)
+    db.session.commit()
+    todo.queue_sheet_update()
+    db.session.commit()
+
+    assert service.flush_mutations() == 1
+    assert [row[0] for row in sheets.tabs["Todos"][1:]] == [
+        "Milk",
+        "Sheet todo",
+        "Kiosk todo",
+    ]
+    assert db.session.get(Todo, todo.id).google_sheet_row == 4
+    assert SheetMutation.query.count() == 0
+    print("✅ New todos are appended without overwriting rows")
+
+
+def test_rejected_sheet_edit_is_abandoned(sheets):
+    """Test that an edit Sheets keeps rejecting neither blocks others nor sync."""
+    sheets.tabs["Chores"] += [
+        ["Dishes", "Alex", "daily"],
+        ["Trash", "Sam", "weekly"],
+        ["Beds", "Kim", "daily"],
+    ]
+    service = GoogleSheetsService()
+    service.sync_chores_from_sheets(force=True)
+    for chore in Chore.query.all():
+        chore.mark_completed()
+    sheets.reject = lambda data: data["range"].endswith("3:F3")
+
+    assert service.flush_mutations() == 2
+    assert sheets.tabs["Chores"][1][5] == "TRUE"
+    assert sheets.tabs["Chores"][3][5] == "TRUE"
+    stuck = SheetMutation.query.one()
+    assert stuck.sheet_row == 3 and stuck.attempts == 1
+
+    for _ in range(Config.SHEETS_MUTATION_MAX_ATTEMPTS - 1):
+        service.flush_mutations()
+    assert stuck.attempts == Config.SHEETS_MUTATION_MAX_ATTEMPTS
+    assert stuck.abandoned_at is not None
+    assert SheetMutation.pending().count() == 0
+
+    sheets.tabs["Chores"].append(["Laundry", "Alex", "weekly"])
+    service.sync_chores_from_sheets()
+    assert service.last_sync_report["skipped"] is False
+    assert Chore.query.count() == 4
+    print("✅ Rejected sheet edits are given up on")
+
+
+def test_events_range_serves_unfetched_weeks(app, monkeypatch):
+    """Test that weeks Google could not be asked for are served empty."""
+
+    def not_authenticated(api, version):
+        raise Exception("Not authenticated")
+
+    monkeypatch.setattr(google_calendar, "get_google_client", not_authenticated)
+
+    response = app.test_client().get("/calendar/api/events/range?start=20&weeks=2")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [week["events"] for week in data["weeks"]] == [[], []]
+    assert [week["last_updated"] for week in data["weeks"]] == [None, None]
+    print("✅ Unfetched weeks are served empty")
+
+
 def main():
     """Run all tests."""
     print("🏠 HomeView Application Test Suite")